@@ -3,17 +3,17 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+import threading
 import time
 
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import Depends, FastAPI, UploadFile, File, Request, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 from psycopg2.extensions import connection
 
 from streamer import frame_generator, stop_signals
-import camera_manager
 from db import init_db_pool, close_db_pool, get_db_connection
 from db.schema import create_tables
 from db.auth import authenticate_user, register_user
@@ -27,6 +27,34 @@ except ImportError:
 app = FastAPI()
 
 
+# ── Vision stack ──────────────────────────────────────────────────────────────
+# camera_manager pulls in torch, ultralytics and cv2 — seconds of imports — so
+# it is imported on first use and the API is up in milliseconds. Until then no
+# camera can be running, and the read-only endpoints answer from that.
+
+_camera_manager = None
+_camera_manager_lock = threading.Lock()
+
+# Same switch as camera_manager.PRELOAD: warm the models up right after startup
+PRELOAD = os.getenv("PRELOAD", "1").strip().lower() in ("1", "true", "yes")
+
+_IDLE_STATS = {
+    "peopleCount": 0, "safetyScore": 100, "activityLevel": 0, "events": [],
+    "behavior": {"normal": 100, "loitering": 0, "fast_movement": 0}, "reports": [],
+}
+
+
+def _cm():
+    """camera_manager, imported on first call."""
+    global _camera_manager
+    if _camera_manager is None:
+        with _camera_manager_lock:
+            if _camera_manager is None:
+                import camera_manager
+                _camera_manager = camera_manager
+    return _camera_manager
+
+
 # ── Pydantic models ───────────────────────────────────────────────────────────
 
 class RegisterRequest(BaseModel):
@@ -49,6 +77,8 @@ class StartCameraRequest(BaseModel):
     line         : "x1,y1,x2,y2"   (metro_line only)
     restricted_point: "x,y"        (metro_line only)
     zone         : "x1,y1;x2,y2;…" (zone_detection only)
+    ignore_zones : "x1,y1;x2,y2;…|x1,y1;…" polygons masked out of inference
+    tiles        : "COLSxROWS" tiled inference for wide high-resolution scenes
     """
     camera_id: str
     scenario: str
@@ -57,6 +87,20 @@ class StartCameraRequest(BaseModel):
     restricted_point: str | None = None
     zone: str | None = None
     infer_every: int = 2  # 1=every frame, 2=every 2nd, 3=every 3rd
+    priority: float = 1.0  # relative share of inference capacity under load
+    infer_every_min: int | None = None  # adaptive controller bounds (ADAPTIVE_INFER=1)
+    infer_every_max: int | None = None
+    motion_gate: bool | None = None  # skip inference on still frames (default: MOTION_GATE)
+    roi: bool | None = None  # infer on a crop around the zone / line (default: ROI_INFER)
+    ignore_zones: str | None = None
+    tiles: str | None = None
+    model: str | None = None  # "n" | "s" | "m" (default: INFER_MODEL)
+    cascade: bool | None = None  # nano first, own model only when ambiguous (default: CASCADE)
+    det_cache: bool | None = None  # replay cached boxes on later loops of a file (default: DET_CACHE)
+    frame_cache: bool | None = None  # replay decoded frames from an mmap (default: FRAME_CACHE)
+    reader: str | None = None  # "opencv" | "ffmpeg" (default: READER_BACKEND)
+    decode_every: int | None = None  # ffmpeg reader: keep 1 frame in N (default: the inference rate)
+    keyframes: bool | None = None  # decode keyframes only, for low-priority file / stream cameras
 
 
 # ── Startup / shutdown ────────────────────────────────────────────────────────
@@ -81,7 +125,8 @@ def on_startup() -> None:
 @app.on_event("shutdown")
 def on_shutdown() -> None:
     close_db_pool()
-    camera_manager.stop_all()
+    if _camera_manager is not None:
+        _camera_manager.stop_all()
 
 
 # ── Middleware / static ───────────────────────────────────────────────────────
@@ -112,6 +157,17 @@ def root():
     return {"status": "Smart Surveillance Backend Running"}
 
 
+@app.get("/api/system/ready")
+def system_ready():
+    """Detector preload state and warm-up timings; 503 until the models are ready."""
+    if _camera_manager is None:
+        # Still importing for the preload, or PRELOAD=0: models load with the first camera
+        state = {"ready": not PRELOAD, "state": "importing" if PRELOAD else "lazy"}
+    else:
+        state = _camera_manager.ready_status()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+
 # ── Auth ──────────────────────────────────────────────────────────────────────
 
 @app.post("/api/register")
@@ -219,8 +275,45 @@ def _build_cfg(scenario: str, payload: StartCameraRequest) -> dict:
             if pair.strip()
         ]
 
+    if payload.ignore_zones:
+        cfg["ignore_zones"] = [
+            [[int(v) for v in pair.split(",")] for pair in poly.split(";") if pair.strip()]
+            for poly in payload.ignore_zones.split("|")
+            if poly.strip()
+        ]
+
     # Inference throttle
     cfg["infer_every"] = max(1, min(5, payload.infer_every))
+    cfg["priority"]    = max(0.1, min(10.0, payload.priority))
+    if payload.infer_every_min is not None:
+        cfg["infer_every_min"] = max(1, payload.infer_every_min)
+    if payload.infer_every_max is not None:
+        cfg["infer_every_max"] = max(1, payload.infer_every_max)
+    if payload.motion_gate is not None:
+        cfg["motion_gate"] = payload.motion_gate
+    if payload.roi is not None:
+        cfg["roi"] = payload.roi
+    if payload.model:
+        cfg["model"] = _cm().resolve_weights(payload.model)
+    if payload.cascade is not None:
+        cfg["cascade"] = payload.cascade
+    if payload.det_cache is not None:
+        cfg["det_cache"] = payload.det_cache
+    if payload.frame_cache is not None:
+        cfg["frame_cache"] = payload.frame_cache
+    if payload.reader:
+        reader = payload.reader.strip().lower()
+        if reader not in _cm().READERS:
+            raise HTTPException(status_code=400,
+                                detail=f"Unknown reader: {payload.reader} (expected one of {_cm().READERS})")
+        cfg["reader"] = reader
+    if payload.decode_every is not None:
+        cfg["decode_every"] = max(1, payload.decode_every)
+    if payload.keyframes is not None:
+        cfg["keyframes"] = payload.keyframes
+    if payload.tiles:
+        cols, _, rows = payload.tiles.lower().partition("x")
+        cfg["tiles"] = [max(1, min(4, int(cols))), max(1, min(4, int(rows or cols)))]
 
     # Pass camera_id as name if no camera_name in config
     if "camera_name" not in cfg:
@@ -244,7 +337,9 @@ def start_camera(payload: StartCameraRequest):
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
     try:
-        camera_manager.start(payload.camera_id, payload.scenario, cfg)
+        _cm().start(payload.camera_id, payload.scenario, cfg)
+    except _cm().InvalidModelError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     except ValueError as exc:
         raise HTTPException(status_code=429, detail=str(exc)) from exc
 
@@ -254,14 +349,14 @@ def start_camera(payload: StartCameraRequest):
 @app.post("/cameras/stop")
 def stop_camera(camera_id: str):
     """Stop inference for one camera."""
-    found = camera_manager.stop(camera_id)
+    found = _camera_manager is not None and _camera_manager.stop(camera_id)
     return {"stopped": found, "camera_id": camera_id}
 
 
 @app.get("/cameras/status")
 def cameras_status():
     """List all active camera workers and their state."""
-    return {"cameras": camera_manager.status()}
+    return {"cameras": _camera_manager.status() if _camera_manager is not None else []}
 
 
 @app.get("/cameras/stream/{camera_id}")
@@ -278,10 +373,11 @@ async def stream_camera(camera_id: str, request: Request):
             if await request.is_disconnected():
                 break
 
-            current_hash = camera_manager.get_frame_hash(camera_id)
+            cm = _camera_manager
+            current_hash = cm.get_frame_hash(camera_id) if cm is not None else b""
 
             if current_hash and current_hash != last_hash:
-                frame = camera_manager.get_frame(camera_id)
+                frame = cm.get_frame(camera_id)
                 if frame:
                     last_hash = current_hash
                     yield (
@@ -325,25 +421,27 @@ def _make_placeholder_frame(camera_id: str) -> bytes:
 @app.get("/api/stats")
 def api_stats():
     """Returns the latest aggregated stats and events across all active cameras."""
-    return camera_manager.get_stats()
+    return _camera_manager.get_stats() if _camera_manager is not None else _IDLE_STATS
 
 
 @app.post("/api/clear-events")
 def api_clear_events():
     """Clear all in-memory events — called when the admin page loads."""
-    camera_manager.clear_all_events()
+    if _camera_manager is not None:
+        _camera_manager.clear_all_events()
     return {"cleared": True}
 
 @app.get("/api/stats")
 def api_stats():
     """Returns the latest aggregated stats and events across all active cameras."""
-    return camera_manager.get_stats()
+    return _camera_manager.get_stats() if _camera_manager is not None else _IDLE_STATS
 
 
 @app.post("/api/clear-events")
 def api_clear_events():
     """Clear all in-memory events — called when the admin page loads."""
-    camera_manager.clear_all_events()
+    if _camera_manager is not None:
+        _camera_manager.clear_all_events()
     return {"cleared": True}
 
 
@@ -357,8 +455,23 @@ class CameraConfigPayload(BaseModel):
     camera_id: str
     config_json: dict
 
+# Auto-boot waits for the model preload (at most this long) before starting
+# saved cameras, so they don't race the warm-up for the detector.
+AUTOBOOT_READY_TIMEOUT_S = float(os.getenv("AUTOBOOT_READY_TIMEOUT_S", "300"))
+
+
 @app.on_event("startup")
 def auto_boot_cameras() -> None:
+    threading.Thread(target=_auto_boot, name="auto-boot", daemon=True).start()
+
+
+def _auto_boot() -> None:
+    if PRELOAD:
+        # Off the request path: import the vision stack, load + warm up the detector(s)
+        cm = _cm()
+        cm.preload()
+        if not cm.wait_ready(AUTOBOOT_READY_TIMEOUT_S):
+            print(f"⚠️ Models not ready after {AUTOBOOT_READY_TIMEOUT_S:.0f}s — auto-booting anyway")
     print("Starting auto-boot sequence...")
     db_dep = get_db_connection()
     try:
@@ -374,7 +487,7 @@ def auto_boot_cameras() -> None:
                     try:
                         req = StartCameraRequest(camera_id=cam_id, scenario=scenario, **cfg)
                         built_cfg = _build_cfg(scenario, req)
-                        camera_manager.start(cam_id, scenario, built_cfg)
+                        _cm().start(cam_id, scenario, built_cfg)
                         print(f"✅ Auto-booted camera {cam_id} for admin {admin_id}")
                     except Exception as e:
                         print(f"❌ Failed to auto-boot {cam_id}: {e}")
@@ -427,7 +540,7 @@ def save_camera(payload: CameraConfigPayload, conn: connection = Depends(get_db_
         # Preserve camera_name from the original payload
         if "camera_name" in payload.config_json:
             built_cfg["camera_name"] = payload.config_json["camera_name"]
-        camera_manager.start(payload.camera_id, scenario, built_cfg)
+        _cm().start(payload.camera_id, scenario, built_cfg)
         print(f"\u2705 Auto-started camera {payload.camera_id} ({scenario})")
     except Exception as e:
         print(f"\u26a0\ufe0f Could not auto-start camera {payload.camera_id}: {e}")
@@ -442,8 +555,9 @@ def get_cameras(admin_id: str, conn: connection = Depends(get_db_connection)):
 
 @app.post("/api/system/reset")
 def reset_system():
-    camera_manager.stop_all()
-    camera_manager.clear_all_events()
+    if _camera_manager is not None:
+        _camera_manager.stop_all()
+        _camera_manager.clear_all_events()
     with get_db_connection() as conn:
         with conn.cursor() as cur:
             cur.execute("DELETE FROM camera_configs WHERE admin_id = 'global_admin'")
@@ -456,7 +570,7 @@ def reset_system():
 @app.get("/api/system/active_cameras")
 def active_cameras():
     """Return cameras that are actively running in memory right now."""
-    return camera_manager.get_active_cameras()
+    return _camera_manager.get_active_cameras() if _camera_manager is not None else []
 
 
 # ── VIEWER ACCESS CONTROL ────────────────────────────────────────────────────
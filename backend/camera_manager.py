@@ -2,21 +2,45 @@
 
 from __future__ import annotations
 
+import atexit
 import datetime
 import hashlib
 import math
+import os
 import queue
+import sys
 import threading
 import time
 import uuid
 from collections import defaultdict, deque
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 import cv2
 import numpy as np
 import torch
+import torchvision
 from ultralytics import YOLO
 
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from cascade import CASCADE, CASCADE_CONF_LO, CASCADE_LIGHT, REASONS, CascadeGate, scene_geometry
+from core import model_store
+from core.direct_infer import direct_detector
+from core.inference_backend import resolve_backend
+from core.model_registry import get_model, resolve_weights
+from detection_cache import (DET_CACHE, DET_CACHE_DIR, DET_CACHE_MAX_MB, DetectionCache,
+                             file_stamp, source_key)
+from ffmpeg_reader import READER_BACKEND, READERS, open_capture
+from frame_cache import FRAME_CACHE, FRAME_CACHE_DIR, FRAME_CACHE_MAX_MB, FrameCache
+from frame_ring import FrameRing, FrameSlot
+from infer_pool import InferencePool, compact_results
+from infer_scheduler import FrameScheduler
+from rate_controller import ADAPTIVE_EVERY_MIN, AdaptiveRateController
+from reader_engine import READER_WORKERS, ReaderEngine
+
 # ── Config ─────────────────────────────────────────────────────────────────────
 MAX_CAMERAS     = 100
 INFER_WIDTH     = 480       # inference resolution — less GPU work
@@ -26,17 +50,94 @@ CONF            = 0.28
 CLASSES         = [0]       # person only
 RECONNECT_DELAY = 2.0
 
-_infer_queue: queue.Queue = queue.Queue(maxsize=MAX_CAMERAS * 3)
+# Cross-camera dynamic batching: the inference thread gathers up to
+# INFER_BATCH_SIZE pending frames (waiting at most INFER_BATCH_WAIT_MS after
+# the first one) and runs them through a single predict() call.
+# INFER_BATCH_SIZE=1 keeps the classic one-frame-at-a-time loop.
+INFER_BATCH_SIZE    = max(1, int(os.getenv("INFER_BATCH_SIZE", "1")))
+INFER_BATCH_WAIT_MS = max(0.0, float(os.getenv("INFER_BATCH_WAIT_MS", "10")))
+
+# Multi-process inference: INFER_WORKERS=0 keeps the single in-process
+# infer-thread; N>0 (or "auto" = one worker per 4 cores) starts a pool of
+# detector processes fed through shared-memory frame slots. Slots only hold
+# in-flight frames — 2 batches per worker, plus room for tiled jobs.
+_workers_env     = os.getenv("INFER_WORKERS", "0").strip().lower()
+INFER_WORKERS    = (max(1, (os.cpu_count() or 1) // 4) if _workers_env == "auto"
+                    else max(0, int(_workers_env or 0)))
+INFER_POOL_SLOTS = max(2, int(os.getenv("INFER_POOL_SLOTS",
+                                        str(max(1, INFER_WORKERS) * INFER_BATCH_SIZE * 2 + 16))))
+
+# Fair scheduling: "weighted" gives each camera a share proportional to
+# priority / infer_every; "rr" serves all ready cameras strictly in turn.
+INFER_SCHED_POLICY = os.getenv("INFER_SCHED_POLICY", "weighted").strip().lower()
+
+# Staleness budget: a frame not picked up for inference within INFER_STALE_MS
+# of capture is dropped rather than annotated late (0 disables). Cameras can
+# override it with "stale_ms" in their config.
+INFER_STALE_MS = max(0.0, float(os.getenv("INFER_STALE_MS", "500")))
+
+# Direct tensor path: letterbox into preallocated buffers, raw forward pass
+# and batched NMS (core/direct_infer.py) instead of model.predict(); the
+# detector returns plain (N, 6) arrays. Same boxes, less per-call overhead.
+INFER_DIRECT = os.getenv("INFER_DIRECT", "0").strip().lower() in ("1", "true", "yes")
+
+# Motion gate: before a due frame goes to the detector, its tiny grayscale
+# thumbnail is compared with the thumbnail of the last inferred frame. If
+# fewer than MOTION_THRESHOLD of the pixels moved by more than
+# MOTION_PIXEL_DELTA, the annotator reuses the last detections instead.
+# A full inference is forced at least every MOTION_MAX_SKIP_S seconds.
+# Per-camera "motion_gate": true/false overrides MOTION_GATE.
+MOTION_GATE        = os.getenv("MOTION_GATE", "0").strip().lower() in ("1", "true", "yes")
+MOTION_THUMB       = (64, 36)
+MOTION_PIXEL_DELTA = int(os.getenv("MOTION_PIXEL_DELTA", "12"))
+MOTION_THRESHOLD   = float(os.getenv("MOTION_THRESHOLD", "0.005"))
+MOTION_MAX_SKIP_S  = float(os.getenv("MOTION_MAX_SKIP_S", "2.0"))
+
+# ROI mode (zone_detection / metro_line): infer only on a padded crop around
+# the zone polygon or the line + restricted point, at the same pixel density
+# as a full frame, and map the boxes back. ROI_PAD is the margin as a
+# fraction of the frame height (doubled above the region, where the bodies
+# of people standing on it are). Per-camera "roi": true/false overrides
+# ROI_INFER. "ignore_zones" polygons are greyed out of the inference input
+# in any mode.
+ROI_INFER = os.getenv("ROI_INFER", "0").strip().lower() in ("1", "true", "yes")
+ROI_PAD   = float(os.getenv("ROI_PAD", "0.15"))
+
+# Tiled mode for wide, high-resolution scenes: cameras with "tiles": [cols,
+# rows] in their config have each source frame cut into overlapping tiles,
+# each downscaled to INFER_WIDTH, all sent in one batch; boxes are merged
+# with a cross-tile NMS. Opt-in per camera only — ROI mode is ignored there.
+TILE_OVERLAP = min(0.5, max(0.0, float(os.getenv("TILE_OVERLAP", "0.2"))))
+TILE_NMS_IOU = float(os.getenv("TILE_NMS_IOU", "0.5"))
+
+# Rectangular inference: instead of imgsz=INFER_WIDTH (letterboxed to a
+# square whenever a batch mixes frame shapes), every frame gets the smallest
+# stride-aligned (H, W) that holds it — a 480x270 frame runs at 480x288 —
+# and batches only group frames of the same input shape.
+INFER_RECT = os.getenv("INFER_RECT", "0").strip().lower() in ("1", "true", "yes")
+STRIDE     = 32         # YOLOv8 max stride: detector inputs are multiples of it
+
+# Startup preload: preload() loads PRELOAD_MODELS (default: INFER_MODEL, plus
+# CASCADE_LIGHT when the cascade is on) in the background — in every pool
+# worker in pool mode — and runs WARMUP_RUNS dummy forward passes per batch
+# size (1 and INFER_BATCH_SIZE) at INFER_WIDTH, so the first camera doesn't
+# pay for loading and the slow first passes. ready_status() reports progress.
+PRELOAD        = os.getenv("PRELOAD", "1").strip().lower() in ("1", "true", "yes")
+PRELOAD_MODELS = [m.strip() for m in os.getenv("PRELOAD_MODELS", "").split(",") if m.strip()]
+WARMUP_RUNS    = max(1, int(os.getenv("WARMUP_RUNS", "2")))
 
 _result_queues:  dict[str, queue.Queue]     = {}
-_latest_frames:  dict[str, bytes | None]   = {}
+_latest_frames:  dict[str, memoryview | None] = {}   # JPEG, bytes-like
 _latest_hashes:  dict[str, bytes]          = {}   # for frame dedup in stream endpoint
 _frame_locks:    dict[str, threading.Lock] = {}
 _reader_stop:    dict[str, threading.Event] = {}
 _annotator_stop: dict[str, threading.Event] = {}
+_rings:          dict[str, FrameRing]      = {}   # reader frame buffers per camera
 _registry_lock = threading.Lock()
 
 _jpeg_pool = ThreadPoolExecutor(max_workers=MAX_CAMERAS, thread_name_prefix="jpeg")
+# File-source readers share READER_WORKERS threads; None = a thread per camera
+_reader_engine = ReaderEngine(READER_WORKERS) if READER_WORKERS > 0 else None
 
 # ── Stats & Events ─────────────────────────────────────────────────────────────
 _stats_lock = threading.Lock()
@@ -100,26 +201,15 @@ def get_stats() -> dict:
 
 
 # ── YOLO model ─────────────────────────────────────────────────────────────────
-_model:            YOLO | None = None
-_model_lock                    = threading.Lock()
 _device: str                   = "cuda" if torch.cuda.is_available() else "cpu"
 _infer_started                 = False
 _infer_start_lock              = threading.Lock()
+_pool: InferencePool | None    = None
 
 
-def _get_model() -> YOLO:
-    global _model
-    if _model is None:
-        with _model_lock:
-            if _model is None:
-                print(f"[camera_manager] Loading YOLOv8s on {_device} imgsz={INFER_WIDTH}...")
-                _model = YOLO("yolov8s")
-                try:
-                    _model.fuse()
-                except Exception:
-                    pass
-                print("[camera_manager] Model ready.")
-    return _model
+def _get_model(weights: str | None = None, backend: str | None = None) -> YOLO:
+    """Shared detector from core.model_registry (defaults: INFER_MODEL, INFER_BACKEND)."""
+    return get_model(weights, INFER_WIDTH, backend, device=_device)
 
 
 # ── Centroid tracker ───────────────────────────────────────────────────────────
@@ -131,8 +221,9 @@ class _CentroidTracker:
         self.lost:    dict[int, int]         = {}
         self.max_lost = max_lost
 
-    def update(self, boxes: list) -> list:
-        if not boxes:
+    def update(self, boxes: np.ndarray) -> list:
+        """(N, 4) int xyxy boxes → [(x1, y1, x2, y2, track_id), ...]."""
+        if not len(boxes):
             for tid in list(self.lost):
                 self.lost[tid] += 1
                 if self.lost[tid] > self.max_lost:
@@ -140,14 +231,13 @@ class _CentroidTracker:
                     del self.lost[tid]
             return []
 
-        new_c = np.array(
-            [[(x1+x2)/2, (y1+y2)/2, x2-x1, y2-y1] for x1,y1,x2,y2 in boxes],
-            dtype=float,
-        )
+        rows  = boxes.tolist()
+        new_c = np.stack([(boxes[:, 0] + boxes[:, 2]) / 2, (boxes[:, 1] + boxes[:, 3]) / 2,
+                          boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1]], axis=1).astype(float)
 
         if not self.objects:
             result = []
-            for i, (x1,y1,x2,y2) in enumerate(boxes):
+            for i, (x1,y1,x2,y2) in enumerate(rows):
                 tid = self.next_id; self.next_id += 1
                 self.objects[tid] = new_c[i]; self.lost[tid] = 0
                 result.append((x1,y1,x2,y2,tid))
@@ -156,28 +246,27 @@ class _CentroidTracker:
         obj_ids = list(self.objects.keys())
         obj_c   = np.array([self.objects[t] for t in obj_ids])
 
-        cost = np.zeros((len(obj_ids), len(new_c)))
-        for i, oc in enumerate(obj_c):
-            for j, nc in enumerate(new_c):
-                d     = math.hypot(oc[0]-nc[0], oc[1]-nc[1])
-                avg_h = max(1, (oc[3]+nc[3])/2)
-                cost[i,j] = d / avg_h
+        # Centroid distance in units of average box height, all pairs at once
+        d     = np.hypot(obj_c[:, None, 0] - new_c[None, :, 0], obj_c[:, None, 1] - new_c[None, :, 1])
+        cost  = d / np.maximum(1, (obj_c[:, None, 3] + new_c[None, :, 3]) / 2)
 
         matched_o: set[int] = set()
         matched_n: set[int] = set()
         pairs: list = []
-        for oi, ni in sorted(np.ndindex(cost.shape), key=lambda ij: cost[ij]):
+        for flat in np.argsort(cost, axis=None, kind="stable"):
+            oi, ni = divmod(int(flat), cost.shape[1])
+            if cost[oi, ni] >= 1.5:
+                break
             if oi in matched_o or ni in matched_n:
                 continue
-            if cost[oi, ni] < 1.5:
-                pairs.append((oi, ni))
-                matched_o.add(oi); matched_n.add(ni)
+            pairs.append((oi, ni))
+            matched_o.add(oi); matched_n.add(ni)
 
         result = []
         for oi, ni in pairs:
             tid = obj_ids[oi]
             self.objects[tid] = new_c[ni]; self.lost[tid] = 0
-            x1,y1,x2,y2 = boxes[ni]
+            x1,y1,x2,y2 = rows[ni]
             result.append((x1,y1,x2,y2,tid))
 
         for oi, tid in enumerate(obj_ids):
@@ -186,7 +275,7 @@ class _CentroidTracker:
                 if self.lost[tid] > self.max_lost:
                     del self.objects[tid]; del self.lost[tid]
 
-        for ni, box in enumerate(boxes):
+        for ni, box in enumerate(rows):
             if ni not in matched_n:
                 tid = self.next_id; self.next_id += 1
                 x1,y1,x2,y2 = box
@@ -215,132 +304,1018 @@ def _point_in_polygon(point, polygon):
     return inside
 
 
+# ── Inference scheduling ───────────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class _InferJob:
+    camera_id: str
+    inf_frame: np.ndarray | list    # tiled jobs: one frame per tile
+    ann_frame: np.ndarray
+    ann_scale: float
+    cfg:       dict
+    vid_time:  float
+    captured:  float = 0.0          # time.monotonic() when the frame was read
+    deadline:  float = 0.0          # monotonic drop-after time, 0 = never stale
+    origin:    tuple = (0, 0)       # ann-frame offset of the inferred crop
+    imgsz:     int | tuple = INFER_WIDTH    # detector input size (S or (H, W) in rect mode)
+    model:     str | None = None    # weights name, None = INFER_MODEL default
+    backend:   str | None = None    # inference backend, None = INFER_BACKEND default
+    cascade:   tuple | None = None  # (camera_id, scene geometry) when the cascade is on
+    cache_ref: tuple | None = None  # (source key, frame index) for the detection cache
+    tiles:     list | None = None   # tiled jobs: (ox, oy, k) per tile
+    buffers:   FrameSlot | None = None  # the camera's frame-ring slot holding the frames
+
+
+# camera_id → its newest job not yet routed or dropped. Frames that skip the
+# detector only short-circuit to the annotator while a camera has none —
+# otherwise they would overtake its older frames still queued or in flight.
+_outstanding: dict[str, _InferJob] = {}
+_outstanding_lock = threading.Lock()
+
+
+def _job_done(job: _InferJob):
+    """Mark `job` routed or dropped, unless a newer job has replaced it."""
+    with _outstanding_lock:
+        if _outstanding.get(job.camera_id) is job:
+            del _outstanding[job.camera_id]
+
+
+def _release_job(job: _InferJob):
+    """Scheduler on_drop hook — a superseded job gives back its ring slot."""
+    _job_done(job)
+    if job.buffers is not None:
+        job.buffers.release()
+
+
+_scheduler = FrameScheduler(on_drop=_release_job)
+
+
+def _count_stale(camera_id: str, n: int = 1):
+    with _stats_lock:
+        cs = _camera_stats.get(camera_id)
+        if cs is not None:
+            cs["frames_stale"] += n
+
+
+def _drop_stale(batch: list) -> list:
+    """Discard jobs past their deadline (counted per camera); return the rest."""
+    now  = time.monotonic()
+    keep = []
+    for job in batch:
+        if job.deadline and now > job.deadline:
+            _release_job(job)
+            _count_stale(job.camera_id)
+        else:
+            keep.append(job)
+    return keep
+
+
+_rate_params: dict[str, tuple[float, float]] = {}   # camera_id → (fps, priority)
+_cam_models:  dict[str, str]                = {}   # camera_id → weights
+
+
+def _apply_rate(camera_id: str, every: int):
+    """Push an effective infer_every into the scheduler as weight + interval."""
+    params = _rate_params.get(camera_id)
+    if params is None:
+        return
+    fps, priority = params
+    weight = priority / every if INFER_SCHED_POLICY != "rr" else 1.0
+    _scheduler.update(camera_id, weight=weight, interval=every / fps)
+
+
+_rates = AdaptiveRateController(apply=_apply_rate)
+
+
+def _register_camera(camera_id: str, cfg: dict):
+    fps         = float(cfg.get("fps", 25)) or 25.0
+    infer_every = max(1, int(cfg.get("infer_every", 3)))
+    _rate_params[camera_id] = (fps, float(cfg.get("priority", 1.0)))
+    _cam_models[camera_id]  = cfg["model"]
+
+    _rates.register(camera_id, infer_every,
+                    cfg.get("infer_every_min"), cfg.get("infer_every_max"))
+    _scheduler.register(camera_id, interval=0.0, slack=0.5 / fps)
+    _apply_rate(camera_id, _rates.effective(camera_id))
+
+
+def _rate_status(camera_id: str) -> dict:
+    every  = _rates.effective(camera_id)
+    params = _rate_params.get(camera_id)
+    if every is None or params is None:
+        return {}
+    return {"model": _cam_models.get(camera_id),
+            "infer_every": every, "infer_fps": round(params[0] / every, 2),
+            "adaptive": _rates.enabled}
+
+
+def _unregister_camera(camera_id: str):
+    _scheduler.unregister(camera_id)
+    _rates.unregister(camera_id)
+    _rate_params.pop(camera_id, None)
+    _cam_models.pop(camera_id, None)
+    _gate.forget(camera_id)
+    with _outstanding_lock:
+        _outstanding.pop(camera_id, None)
+
+
 # ── Inference thread ───────────────────────────────────────────────────────────
 
+def _rect_imgsz(h: int, w: int, imgsz: int) -> tuple[int, int]:
+    """Smallest stride-aligned (H, W) input for an (h, w) frame scaled to fit `imgsz`."""
+    r = imgsz / max(h, w)
+    return -(-round(h * r) // STRIDE) * STRIDE, -(-round(w * r) // STRIDE) * STRIDE
+
+
+def _predict_batch(model: YOLO, frames: list, imgsz: int | tuple = INFER_WIDTH,
+                   conf: float = CONF) -> list:
+    """
+    One detector call for the whole batch — one Results per frame, or one
+    (N, 6) array per frame on the INFER_DIRECT path.
+    """
+    try:
+        if INFER_DIRECT:
+            return direct_detector(model)(frames, imgsz, conf, iou=0.50, classes=CLASSES)
+        return model.predict(
+            frames,
+            classes=CLASSES,
+            conf=conf,
+            iou=0.50,
+            device=_device,
+            imgsz=imgsz,
+            verbose=False,
+        )
+    except Exception as exc:
+        print(f"[InferenceThread] error: {exc}")
+        return [None] * len(frames)
+
+
+_gate = CascadeGate()
+
+
+def _try_load(loader, weights: str | None, backend: str | None) -> YOLO | None:
+    """loader(weights, backend), or None when the model can't be loaded."""
+    try:
+        return loader(weights, backend)
+    except Exception as exc:
+        print(f"[InferenceThread] can't load {weights or 'default model'}: {exc!r}")
+        return None
+
+
+def _detect_batch(loader, frames: list, imgsz: int | tuple, weights: str | None,
+                  extras: list, backend: str | None = None) -> tuple[list, list]:
+    """
+    Detector call for frames sharing (weights, backend, imgsz). Frames with a
+    cascade context (extras[i]) go through CASCADE_LIGHT first and only reach
+    `weights` when the gate finds them ambiguous. Returns (results, notes):
+    a note is the escalation reason, "" for a light-only answer and None for
+    frames outside the cascade. A model that fails to load fails only these
+    frames, like a failed predict — a light model's go to the heavy one.
+    """
+    out:   list = [None] * len(frames)
+    notes: list = [None] * len(frames)
+    heavy = [i for i, extra in enumerate(extras) if extra is None]
+    light = [i for i, extra in enumerate(extras) if extra is not None]
+    if light:
+        model = _try_load(loader, CASCADE_LIGHT, backend)
+        res_l = (_predict_batch(model, [frames[i] for i in light], imgsz, conf=CASCADE_CONF_LO)
+                 if model is not None else [None] * len(light))
+        for i, res in zip(light, res_l):
+            det = compact_results(res)
+            why = _gate.check(*extras[i], det, CONF) if res is not None else "error"
+            if why:
+                heavy.append(i)
+            else:
+                out[i] = det[det[:, 4] >= CONF]
+            notes[i] = why
+    if heavy:
+        heavy.sort()
+        model = _try_load(loader, weights, backend)
+        res_h = (_predict_batch(model, [frames[i] for i in heavy], imgsz)
+                 if model is not None else [None] * len(heavy))
+        for i, res in zip(heavy, res_h):
+            out[i] = res
+    return out, notes
+
+
+def _pool_predict(loader, frames: list, imgsz: int | tuple, model: tuple,
+                  extras: list) -> tuple[list, list]:
+    """Pool workers' predict(): the pool's model key is (weights, backend)."""
+    return _detect_batch(loader, frames, imgsz, model[0], extras, model[1])
+
+
+def _count_cascade(camera_id: str, note: str | None):
+    if note is None:
+        return
+    with _stats_lock:
+        cs = _camera_stats.get(camera_id)
+        if cs is not None:
+            cs["cascade_checked"] += 1
+            if note:
+                cs["cascade_reasons"][note] = cs["cascade_reasons"].get(note, 0) + 1
+
+
+def _merge_tiles(tiles: list, results: list) -> np.ndarray:
+    """Per-tile detections → one (N, 6) array in ann coords, cross-tile NMS'd."""
+    parts = []
+    for (ox, oy, k), res in zip(tiles, results):
+        if res is None:
+            continue
+        det = res if isinstance(res, np.ndarray) else res.boxes.data.cpu().numpy()
+        if not len(det):
+            continue
+        det = det[:, :6].astype(np.float32)
+        det[:, [0, 2]] = det[:, [0, 2]] * k + ox
+        det[:, [1, 3]] = det[:, [1, 3]] * k + oy
+        parts.append(det)
+    if not parts:
+        return np.zeros((0, 6), dtype=np.float32)
+    det  = np.concatenate(parts)
+    keep = torchvision.ops.nms(torch.from_numpy(det[:, :4]), torch.from_numpy(det[:, 4]),
+                               TILE_NMS_IOU)
+    return det[keep.numpy()]
+
+
+def _det_records(results: list, ox: float = 0, oy: float = 0, k: float = 1.0) -> np.ndarray:
+    """
+    Detector output (Results objects and/or (N, 6) arrays) → compact (N, 5)
+    float32 records x1, y1, x2, y2, conf, boxes mapped to whole annotate-frame
+    pixels as x*k + ox. This is all that travels to the annotator — no
+    tensors, no Results holding a copy of the inference frame.
+    """
+    det = (np.concatenate([compact_results(r) for r in results]) if results
+           else np.zeros((0, 6), dtype=np.float32))
+    rec = np.empty((len(det), 5), dtype=np.float32)
+    rec[:, [0, 2]] = np.trunc(np.trunc(det[:, [0, 2]]) * k + ox)
+    rec[:, [1, 3]] = np.trunc(np.trunc(det[:, [1, 3]]) * k + oy)
+    rec[:, 4]      = det[:, 4]
+    return rec
+
+
+def _job_payload(job: _InferJob, results: list) -> tuple:
+    """Annotator payload: (ann_frame, ann_scale, records, cfg, vid_time, cache_ref, buffers)."""
+    if job.tiles:
+        dets = _det_records([_merge_tiles(job.tiles, results)])
+    else:
+        dets = _det_records(results[:1], *job.origin, ANNOTATE_WIDTH / INFER_WIDTH)
+    return job.ann_frame, job.ann_scale, dets, job.cfg, job.vid_time, job.cache_ref, job.buffers
+
+
+def _release_payload(payload: tuple):
+    if payload[6] is not None:
+        payload[6].release()
+
+
+def _route_result(camera_id: str, payload: tuple):
+    rq = _result_queues.get(camera_id)
+    if rq is None:
+        _release_payload(payload)
+        return
+    if rq.full():
+        try: _release_payload(rq.get_nowait())
+        except queue.Empty: pass
+    try: rq.put_nowait(payload)
+    except queue.Full: _release_payload(payload)
+
+
+def _route_skipped(camera_id: str, payload: tuple):
+    """
+    Route a frame that skipped the detector. While an older frame of the
+    camera is still queued or in flight it would overtake it, so it is
+    dropped instead, like a superseded frame.
+    """
+    _scheduler.skip(camera_id)
+    if camera_id in _outstanding:
+        _release_payload(payload)
+    else:
+        _route_result(camera_id, payload)
+
+
 def _inference_thread_fn():
-    model = _get_model()
-    print("[InferenceThread] running")
+    _try_load(_get_model, None, None)
+    print(f"[InferenceThread] running  batch={INFER_BATCH_SIZE} "
+          f"wait={INFER_BATCH_WAIT_MS:.0f}ms policy={INFER_SCHED_POLICY}")
+    while True:
+        # Batches only mix cameras that share a model, backend and input size
+        batch = _scheduler.get_batch(INFER_BATCH_SIZE, INFER_BATCH_WAIT_MS / 1000.0,
+                                     timeout=1.0,
+                                     key=lambda job: (job.model, job.backend, job.imgsz))
+        if batch is None:
+            break
+        batch = _drop_stale(batch)
+        if not batch:
+            continue
+
+        t_deq = time.monotonic()
+        for job in batch:
+            _rates.observe(job.camera_id, wait_s=t_deq - job.captured)
+
+        # Batches are keyed on (model, backend, imgsz), so this is normally
+        # one group. Tiled jobs contribute all their tiles to the same call.
+        groups: dict[tuple, list] = defaultdict(list)
+        for job in batch:
+            groups[job.model, job.backend, job.imgsz].append(job)
+
+        for (weights, backend, imgsz), jobs in groups.items():
+            frames = [f for job in jobs
+                      for f in (job.inf_frame if job.tiles else [job.inf_frame])]
+            extras = [job.cascade for job in jobs
+                      for _ in (job.tiles if job.tiles else [None])]
+            results, notes = _detect_batch(_get_model, frames, imgsz, weights, extras, backend)
+
+            t_done = time.monotonic()
+            i = 0
+            for job in jobs:
+                n = len(job.tiles) if job.tiles else 1
+                _count_cascade(job.camera_id, notes[i])
+                _route_result(job.camera_id, _job_payload(job, results[i:i + n]))
+                _job_done(job)
+                _rates.observe(job.camera_id, lag_s=t_done - job.captured)
+                i += n
+
+
+def _pool_accepts(camera_id: str, job: _InferJob) -> bool:
+    """Scheduler `accept` in pool mode: only serve cameras whose worker has room."""
+    return _pool.has_capacity(camera_id, (job.model, job.backend),
+                              len(job.tiles) if job.tiles else 1)
+
+
+def _dispatch_thread_fn():
+    """Pool mode: hand scheduled frames to worker processes as their workers free up."""
+    print(f"[Dispatcher] running  workers={INFER_WORKERS} policy={INFER_SCHED_POLICY}")
     while True:
         try:
-            item = _infer_queue.get(timeout=1.0)
+            job = _scheduler.get(timeout=1.0, accept=_pool_accepts)
         except queue.Empty:
             continue
-        if item is None:
+        if job is None:
             break
-
-        camera_id, infer_frame, ann_frame, scale_ann, cfg, vid_time = item
-        try:
-            results = model.predict(
-                infer_frame,
-                classes=CLASSES,
-                conf=CONF,
-                iou=0.50,
-                device=_device,
-                imgsz=INFER_WIDTH,
-                verbose=False,
-            )
-        except Exception as exc:
-            print(f"[InferenceThread] error: {exc}")
-            results = []
-
-        rq = _result_queues.get(camera_id)
-        if rq is not None:
-            if rq.full():
-                try: rq.get_nowait()
-                except queue.Empty: pass
-            try: rq.put_nowait((ann_frame, scale_ann, results, cfg, vid_time))
-            except queue.Full: pass
-
-        _infer_queue.task_done()
+        if not _drop_stale([job]):
+            continue
+        _rates.observe(job.camera_id, wait_s=time.monotonic() - job.captured)
+        # Staged only now: the job's ring slot kept the frame until a worker
+        # could take it, and shared memory holds in-flight frames only
+        frames = job.inf_frame if job.tiles else [job.inf_frame]
+        slots  = [_pool.stage(f) for f in frames]
+        if any(slot is None for slot in slots):
+            for slot in slots:
+                if slot is not None:
+                    _pool.release(slot)
+            _release_job(job)
+            continue
+        # Workers re-check the deadline — monotonic time is shared system-wide
+        if job.tiles:
+            # The camera's worker batches the tiles together
+            gather = {"job": job, "results": [None] * len(job.tiles),
+                      "left": len(job.tiles), "stale": False}
+            for idx, (slot, tile) in enumerate(zip(slots, frames)):
+                _pool.dispatch(job.camera_id, slot, *tile.shape[:2], (gather, idx),
+                               deadline=job.deadline, imgsz=job.imgsz,
+                               model=(job.model, job.backend))
+            continue
+        _pool.dispatch(job.camera_id, slots[0], *job.inf_frame.shape[:2], (job, None),
+                       deadline=job.deadline, imgsz=job.imgsz,
+                       model=(job.model, job.backend), extra=job.cascade)
+
+
+def _on_pool_result(camera_id: str, boxes: np.ndarray | None, meta: tuple,
+                    note: str | None = None):
+    target, idx = meta
+    if idx is not None:     # one tile of a tiled job — wait for the rest
+        target["results"][idx] = boxes
+        target["stale"]  |= boxes is None
+        target["left"]   -= 1
+        if target["left"]:
+            return
+        job, boxes = target["job"], None if target["stale"] else target["results"]
+    else:
+        job, boxes = target, None if boxes is None else [boxes]
+
+    if boxes is None:       # went stale while queued on a worker
+        _count_stale(camera_id)
+        _release_job(job)
+        return
+    if idx is None:
+        _count_cascade(camera_id, note)
+    _route_result(camera_id, _job_payload(job, boxes))
+    _job_done(job)
+    _rates.observe(camera_id, lag_s=time.monotonic() - job.captured)
 
 
 def _ensure_infer_thread():
-    global _infer_started
+    global _infer_started, _pool
     with _infer_start_lock:
-        if not _infer_started:
+        if _infer_started:
+            return
+        if INFER_WORKERS > 0:
+            print(f"[camera_manager] starting {INFER_WORKERS} inference worker process(es)")
+            _pool = InferencePool(
+                workers=INFER_WORKERS,
+                n_slots=INFER_POOL_SLOTS,
+                slot_h=INFER_WIDTH * 2,      # room for portrait sources
+                slot_w=INFER_WIDTH,
+                loader=_get_model,
+                predict=_pool_predict,
+                on_result=_on_pool_result,
+                batch_size=INFER_BATCH_SIZE,
+                wait_ms=INFER_BATCH_WAIT_MS,
+                warmup=_warm_models if PRELOAD else None,
+                on_free=_scheduler.wake,
+            )
+            atexit.register(_pool.close)
+            threading.Thread(
+                target=_dispatch_thread_fn,
+                name="infer-dispatch", daemon=True,
+            ).start()
+        else:
             threading.Thread(
                 target=_inference_thread_fn,
                 name="infer-thread", daemon=True,
             ).start()
-            _infer_started = True
+        _infer_started = True
+
+
+# ── Model preload ──────────────────────────────────────────────────────────────
+
+_ready_event = threading.Event()
+_ready_state: dict = {"state": "idle", "models": {}, "error": None, "elapsed_s": None}
+if not PRELOAD:
+    # Models load lazily with the first camera — ready from the start, even
+    # if preload() is never called
+    _ready_state["state"] = "lazy"
+    _ready_event.set()
+
+
+def _preload_weights() -> list[str]:
+    names = PRELOAD_MODELS or [None] + ([CASCADE_LIGHT] if CASCADE else [])
+    return list(dict.fromkeys(resolve_weights(n) for n in names))
+
+
+def _warm_models(loader=_get_model) -> dict:
+    """
+    Load every preload model through `loader` and time WARMUP_RUNS dummy
+    batches per batch size. Also each pool worker's startup warmup().
+    """
+    h     = int(INFER_WIDTH * 9 / 16)
+    imgsz = _rect_imgsz(h, INFER_WIDTH, INFER_WIDTH) if INFER_RECT else INFER_WIDTH
+    sizes = sorted({1, INFER_BATCH_SIZE})
+    out: dict = {}
+    for weights in _preload_weights():
+        t0    = time.perf_counter()
+        model = loader(weights)
+        info  = {"load_s": round(time.perf_counter() - t0, 3), "warmup_ms": {}}
+        for bs in sizes:
+            frames = [np.zeros((h, INFER_WIDTH, 3), dtype=np.uint8)] * bs
+            runs   = []
+            for _ in range(WARMUP_RUNS):
+                t0 = time.perf_counter()
+                _predict_batch(model, frames, imgsz)
+                runs.append(round((time.perf_counter() - t0) * 1000, 1))
+            info["warmup_ms"][bs] = runs
+        out[weights] = info
+    return out
+
+
+def _preload_thread_fn():
+    t0 = time.perf_counter()
+    try:
+        if INFER_WORKERS > 0:
+            _ensure_infer_thread()
+            _pool.wait_ready()
+            _ready_state["models"] = {f"worker{i}": info
+                                      for i, info in sorted(_pool.ready_info().items())}
+        else:
+            _ready_state["models"] = _warm_models()
+        _ready_state["state"] = "ready"
+    except Exception as exc:
+        print(f"[camera_manager] model preload failed: {exc}")
+        _ready_state.update(state="error", error=str(exc))
+    _ready_state["elapsed_s"] = round(time.perf_counter() - t0, 2)
+    print(f"[camera_manager] preload {_ready_state['state']} "
+          f"in {_ready_state['elapsed_s']}s")
+    _ready_event.set()
+
+
+def preload() -> None:
+    """Start loading and warming up the detector(s) in the background."""
+    with _infer_start_lock:
+        if _ready_state["state"] != "idle":
+            return          # already loading/loaded, or "lazy" (PRELOAD=0)
+        _ready_state["state"] = "loading"
+    threading.Thread(target=_preload_thread_fn, name="model-preload", daemon=True).start()
 
 
-# ── Frame reader thread ────────────────────────────────────────────────────────
+def wait_ready(timeout: float | None = None) -> bool:
+    """Block until preload() has finished (successfully or not)."""
+    return _ready_event.wait(timeout)
 
-def _reader_thread_fn(camera_id: str, cfg: dict, stop: threading.Event):
-    video       = cfg.get("video", 0)
-    infer_every = max(1, int(cfg.get("infer_every", 3)))
 
-    print(f"[Reader:{camera_id[:8]}] opening {video}  infer_every={infer_every}")
+def ready_status() -> dict:
+    out = {"ready": _ready_state["state"] in ("ready", "lazy"), "device": _device,
+           "workers": INFER_WORKERS, **_ready_state}
+    if _reader_engine is not None:
+        out["reader_engine"] = _reader_engine.stats()
+    if _pool is not None:
+        out["pool"] = _pool.stats()
+    return out
 
-    while not stop.is_set():
-        cap = cv2.VideoCapture(video if isinstance(video, int) else str(video))
-        if not cap.isOpened():
-            print(f"[Reader:{camera_id[:8]}] cannot open, retry in {RECONNECT_DELAY}s")
-            time.sleep(RECONNECT_DELAY)
-            continue
 
-        fps         = cap.get(cv2.CAP_PROP_FPS) or 25
-        frame_t     = 1.0 / fps
-        frame_count = 0
-        wall_start  = time.perf_counter()
-        frame_base  = 0
-
-        while not stop.is_set():
-            frame_count += 1
-            ret, frame = cap.read()
-            if not ret:
-                # Always loop — whether file or webcam
-                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                wall_start  = time.perf_counter()
-                frame_base  = frame_count
-                # Signal annotator to reset event_fired on next frame
-                with _stats_lock:
-                    if camera_id in _camera_stats:
-                        _camera_stats[camera_id]["loop_reset"] = True
-                continue
+# ── Frame reader thread ────────────────────────────────────────────────────────
 
-            elapsed = frame_count - frame_base
-            target  = wall_start + elapsed * frame_t
-            sleep_n = target - time.perf_counter()
-            if sleep_n > 0:
-                time.sleep(sleep_n)
-            elif sleep_n < -(frame_t * 2):
-                cap.grab(); frame_count += 1
+def _motion_thumb(ann_frame: np.ndarray) -> np.ndarray:
+    small = cv2.resize(ann_frame, MOTION_THUMB, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+
+def _motion_score(thumb: np.ndarray, ref: np.ndarray) -> float:
+    """Fraction of thumbnail pixels that changed by more than MOTION_PIXEL_DELTA."""
+    diff = cv2.absdiff(thumb, ref)
+    return cv2.countNonZero(cv2.threshold(diff, MOTION_PIXEL_DELTA, 255,
+                                          cv2.THRESH_BINARY)[1]) / diff.size
+
+
+def _roi_box(scenario: str, cfg: dict, ann_w: int, ann_h: int,
+             ann_scale: float) -> tuple[int, int, int, int] | None:
+    """Padded (x0, y0, x1, y1) ann-frame region around the zone or line."""
+    if scenario == "zone_detection" and len(cfg.get("zone") or []) >= 3:
+        pts = list(cfg["zone"])
+    elif scenario == "metro_line" and cfg.get("line"):
+        pts = list(cfg["line"])
+        if cfg.get("restricted_point"):
+            pts.append(cfg["restricted_point"])
+    else:
+        return None
+
+    xy  = np.array(pts, dtype=np.float32) * ann_scale
+    pad = ROI_PAD * ann_h
+    x0  = int(max(0, xy[:, 0].min() - pad));     x1 = int(min(ann_w, xy[:, 0].max() + pad))
+    y0  = int(max(0, xy[:, 1].min() - 2 * pad)); y1 = int(min(ann_h, xy[:, 1].max() + pad))
+    if x1 - x0 < 32 or y1 - y0 < 32:
+        return None
+    return x0, y0, x1, y1
+
+
+def _ignore_polys(cfg: dict, ann_scale: float, origin: tuple, inf_scale: float) -> list:
+    """cfg "ignore_zones" (source coords) → int32 polygons in inference-frame coords."""
+    ox, oy = origin
+    polys  = []
+    for poly in cfg.get("ignore_zones") or []:
+        if len(poly) < 3:
+            continue
+        xy = (np.array(poly, dtype=np.float32) * ann_scale - (ox, oy)) * inf_scale
+        polys.append(xy.astype(np.int32))
+    return polys
+
+
+def _cascade_geometry(scenario: str, cfg: dict, ann_scale: float,
+                      origin: tuple, inf_scale: float) -> tuple:
+    """Zone / tripwire of a camera in inference-frame coords for the cascade gate."""
+    def to_inf(pts) -> np.ndarray:
+        return (np.array(pts, dtype=np.float32) * ann_scale - origin) * inf_scale
+
+    segments, zone = [], None
+    if scenario == "metro_line" and cfg.get("line"):
+        segments.append(to_inf(cfg["line"]).ravel())
+    if scenario == "zone_detection" and len(cfg.get("zone") or []) >= 3:
+        zone = to_inf(cfg["zone"])
+        segments += [np.concatenate([a, b]) for a, b in zip(zone, np.roll(zone, -1, axis=0))]
+    return scene_geometry(segments, zone, INFER_WIDTH)
+
+
+def _tile_grid(w: int, h: int, cols: int, rows: int) -> list[tuple[int, int, int, int]]:
+    """(x0, y0, x1, y1) source-frame tiles covering w×h with TILE_OVERLAP overlap."""
+    tw = w / (cols - (cols - 1) * TILE_OVERLAP)
+    th = h / (rows - (rows - 1) * TILE_OVERLAP)
+    boxes = []
+    for r in range(rows):
+        y0 = int(round(r * th * (1 - TILE_OVERLAP)))
+        for c in range(cols):
+            x0 = int(round(c * tw * (1 - TILE_OVERLAP)))
+            boxes.append((x0, y0, min(w, int(round(x0 + tw))), min(h, int(round(y0 + th)))))
+    return boxes
+
+
+_det_cache = DetectionCache(int(DET_CACHE_MAX_MB * 1e6), DET_CACHE_DIR)
+
+
+def _cache_key(video, scenario: str, cfg: dict) -> str | None:
+    """Detection-cache key for a file source, None when caching doesn't apply."""
+    if not cfg.get("det_cache", DET_CACHE) or not isinstance(video, str):
+        return None
+    signature = {k: cfg.get(k) for k in ("model", "roi", "tiles", "ignore_zones",
+                                         "zone", "line", "restricted_point")}
+    # Effective values, env defaults included — a persistent DET_CACHE_DIR
+    # must not replay boxes from a run with other detector settings
+    cascade = bool(cfg.get("cascade", CASCADE))
+    signature.update(scenario=scenario, conf=CONF, infer=INFER_WIDTH, ann=ANNOTATE_WIDTH,
+                     backend=resolve_backend(cfg.get("backend")), rect=INFER_RECT,
+                     direct=INFER_DIRECT, records="xyxy+conf",
+                     cascade=(CASCADE_LIGHT, CASCADE_CONF_LO) if cascade else None)
+    if cfg.get("reader") == "ffmpeg":
+        # Frame indices count decimated frames (or keyframes)
+        signature.update(reader="ffmpeg", decode_every=cfg.get("decode_every"),
+                         keyframes=bool(cfg.get("keyframes")))
+    try:
+        key = source_key(video, signature)
+    except OSError:
+        return None
+    if key is not None:
+        _det_cache.open(key)
+    return key
+
+
+_frame_cache = FrameCache(int(FRAME_CACHE_MAX_MB * 1e6), FRAME_CACHE_DIR)
+atexit.register(_frame_cache.clear)
+
+
+def _open_frame_store(cap: cv2.VideoCapture, video: str):
+    """Frame-cache store for a freshly opened file source, None if unusable."""
+    n    = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    h, w = getattr(cap, "source_hw", None) or (int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                                               int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)))
+    if n <= 0 or not w or not h:
+        return None
+    # Same expressions as the reader's resizes, so the shapes match exactly
+    ann_h = int(h * (ANNOTATE_WIDTH / w))
+    inf_h = int(ann_h * (INFER_WIDTH / ANNOTATE_WIDTH))
+    key   = source_key(video, {"ann": ANNOTATE_WIDTH, "infer": INFER_WIDTH, "n": n,
+                               "every": getattr(cap, "every", 1)})
+    if key is None:
+        return None
+    store = _frame_cache.acquire(key, n, (h, w), (ann_h, ANNOTATE_WIDTH, 3),
+                                 (inf_h, INFER_WIDTH, 3))
+    if store is not None:
+        store.stamp = file_stamp(video)
+    return store
+
+
+def _count_frame_replay(camera_id: str):
+    with _stats_lock:
+        cs = _camera_stats.get(camera_id)
+        if cs is not None:
+            cs["frames_from_cache"] += 1
 
-            if frame_count % infer_every == 0:
-                h, w = frame.shape[:2]
 
-                # Two-stage resize: source → ANNOTATE_WIDTH → INFER_WIDTH
-                ann_scale = ANNOTATE_WIDTH / w
-                ann_frame = cv2.resize(frame, (ANNOTATE_WIDTH, int(h * ann_scale)))
+def _count_cache_hit(camera_id: str):
+    with _stats_lock:
+        cs = _camera_stats.get(camera_id)
+        if cs is not None:
+            cs["det_cache_hits"] += 1
 
-                inf_scale = INFER_WIDTH / ANNOTATE_WIDTH
-                inf_frame = cv2.resize(ann_frame, (INFER_WIDTH, int(ann_frame.shape[0] * inf_scale)))
 
-                pos_msec = cap.get(cv2.CAP_PROP_POS_MSEC)
-                vid_time = pos_msec / 1000.0 if pos_msec else (frame_count / fps)
+def _count_read(camera_id: str, grabbed: int, decoded: int):
+    with _stats_lock:
+        cs = _camera_stats.get(camera_id)
+        if cs is not None:
+            cs["frames_grabbed"] += grabbed
+            cs["frames_decoded"] += decoded
 
-                try:
-                    _infer_queue.put_nowait(
-                        (camera_id, inf_frame, ann_frame, ann_scale, cfg, vid_time)
-                    )
-                except queue.Full:
-                    pass
 
-        cap.release()
-        if not stop.is_set():
-            time.sleep(RECONNECT_DELAY)
+def _count_motion(camera_id: str, skipped: bool):
+    with _stats_lock:
+        cs = _camera_stats.get(camera_id)
+        if cs is not None:
+            cs["motion_checked"] += 1
+            cs["motion_skipped"] += skipped
+
+
+class _CameraReader:
+    """
+    One camera's frame reader as a resumable loop: each step() handles one
+    frame and returns when the reader next wants to run, rather than
+    sleeping. That lets file sources share the ReaderEngine's few threads;
+    the rest are stepped by a thread of their own (_reader_thread_fn).
+    """
+
+    def __init__(self, camera_id: str, scenario: str, cfg: dict, stop: threading.Event):
+        self.camera_id   = camera_id
+        self.name        = f"reader-{camera_id}"
+        self.scenario    = scenario
+        self.cfg         = cfg
+        self.stop        = stop
+        self.video       = video = cfg.get("video", 0)
+        self.infer_every = max(1, int(cfg.get("infer_every", 3)))
+        self.stale_s     = float(cfg.get("stale_ms", INFER_STALE_MS)) / 1000.0
+        self.motion_gate = bool(cfg.get("motion_gate", MOTION_GATE))
+        self.ref_thumb: np.ndarray | None = None    # thumbnail of the last inferred frame
+        self.last_full   = 0.0
+        self.use_roi     = bool(cfg.get("roi", ROI_INFER))
+        self.geom_key: tuple | None = None          # source (h, w) the geometry below is for
+        self.roi: tuple | None      = None
+        self.origin      = (0, 0)
+        self.ignore: list           = []
+        tiles_cfg        = cfg.get("tiles")
+        if isinstance(tiles_cfg, int):
+            tiles_cfg = (tiles_cfg, tiles_cfg)
+        self.tiles_cfg   = tiles_cfg
+        self.tiled       = tiled = bool(tiles_cfg) and tiles_cfg[0] * tiles_cfg[1] > 1
+        self.tile_geom: list  = []                  # (box, scale, ignore polys) per tile
+        self.tile_xform: list = []                  # (ox, oy, k) per tile → ann coords
+        self.use_cascade = (bool(cfg.get("cascade", CASCADE)) and not tiled
+                            and cfg["model"] != CASCADE_LIGHT)
+        self.cascade_ctx: tuple | None = None
+        self.cache_key   = _cache_key(video, scenario, cfg)
+        self.cache_stamp = file_stamp(video) if self.cache_key else None
+        # Decoded-frame cache: filled on the first pass, replayed from then on
+        self.use_frames  = (bool(cfg.get("frame_cache", FRAME_CACHE)) and not tiled
+                            and isinstance(video, str) and file_stamp(video) is not None)
+        self.store       = None
+        self.replay      = False
+        # ffmpeg scales to ANNOTATE_WIDTH itself — except for tiles, which need
+        # the source resolution
+        self.reader      = cfg.get("reader", READER_BACKEND)
+        self.decode_w    = None if tiled else ANNOTATE_WIDTH
+        self.keyframes   = bool(cfg.get("keyframes"))   # paced on timestamps, not frame counts
+        self.ring        = _rings[camera_id] = FrameRing()
+        # Files never block on a read, so they can share the engine's threads
+        self.from_file   = isinstance(video, str) and file_stamp(video) is not None
+        self.cap         = None
+        self.pending     = False     # a frame is grabbed and waiting for its due time
+
+        print(f"[Reader:{camera_id[:8]}] opening {video}  infer_every={self.infer_every}  "
+              f"reader={self.reader}")
+
+    def step(self) -> float | None:
+        """Handle the next frame; returns the time.perf_counter() to run again, None once stopped."""
+        if self.stop.is_set():
+            self.close()
+            return None
+        if self.cap is None and not self._open():
+            return time.perf_counter() + RECONNECT_DELAY
+        if not self.pending:
+            wake = self._advance()
+            if wake is not None:
+                return wake
+        self.pending = False
+        self._process()
+        return time.perf_counter()
+
+    def close(self) -> None:
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        if self.store is not None:
+            _frame_cache.release(self.store)
+            self.store = None
+        if _rings.get(self.camera_id) is self.ring:
+            del _rings[self.camera_id]
+        print(f"[Reader:{self.camera_id[:8]}] exited")
+
+    def _open(self) -> bool:
+        cap = open_capture(self.video, self.reader, self.decode_w,
+                           self.cfg.get("decode_every", 1), self.keyframes)
+        if not cap.isOpened():
+            print(f"[Reader:{self.camera_id[:8]}] cannot open, retry in {RECONNECT_DELAY}s")
+            return False
 
-    print(f"[Reader:{camera_id[:8]}] exited")
+        self.cap         = cap
+        self.src_hw      = getattr(cap, "source_hw", None)   # decoded frames may be pre-scaled
+        self.fps         = cap.get(cv2.CAP_PROP_FPS) or 25
+        self.frame_t     = 1.0 / self.fps
+        self.frame_count = 0
+        self.wall_start  = time.perf_counter()
+        self.frame_base  = 0
+        if self.use_frames and self.store is None:
+            self.store = _open_frame_store(cap, self.video)
+        return True
+
+    def _advance(self) -> float | None:
+        """
+        Move on to the next frame: grab it, or handle the end of a pass. None
+        means it is due now; otherwise the time to come back.
+        """
+        camera_id, cap, store = self.camera_id, self.cap, self.store
+        self.frame_count += 1
+        # grab() only demuxes and decodes; the BGR conversion and copy in
+        # retrieve() are left for frames that are actually used
+        if self.replay:
+            ret = self.frame_count - self.frame_base - 1 < store.n
+        else:
+            ret = cap.grab()
+        if not ret:
+            changed = False
+            if self.cache_key:
+                # End of a pass: persist, and re-key if the file changed
+                _det_cache.save(self.cache_key)
+                if file_stamp(self.video) != self.cache_stamp:
+                    changed = True
+                    _det_cache.drop(self.cache_key)
+                    self.cache_key   = _cache_key(self.video, self.scenario, self.cfg)
+                    self.cache_stamp = file_stamp(self.video) if self.cache_key else None
+            if store is not None:
+                if changed or file_stamp(self.video) != store.stamp:
+                    # New content — drop the frames and decode afresh
+                    _frame_cache.release(store, drop=True)
+                    self.store, self.replay = None, False
+                    cap.release()
+                    self.cap = None
+                    return time.perf_counter() + RECONNECT_DELAY
+                if not self.replay and _frame_cache.finish_pass(store):
+                    print(f"[Reader:{camera_id[:8]}] frame cache complete — replaying")
+                    self.replay = True
+            # Always loop — whether file or webcam
+            if not self.replay:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.wall_start = time.perf_counter()
+            self.frame_base = self.frame_count
+            self.ref_thumb  = None
+            # Signal annotator to reset event_fired on next frame
+            with _stats_lock:
+                if camera_id in _camera_stats:
+                    _camera_stats[camera_id]["loop_reset"] = True
+            return time.perf_counter()
+
+        if self.keyframes:
+            # Keyframes are a GOP apart, not frame_t — pace on their timestamps
+            target = self.wall_start + cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        else:
+            target = self.wall_start + (self.frame_count - self.frame_base) * self.frame_t
+        sleep_n = target - time.perf_counter()
+        if sleep_n > 0:
+            self.pending = True
+            return target
+        if sleep_n < -(self.frame_t * 2) and not self.keyframes:
+            if not self.replay:
+                cap.grab()
+                _count_read(camera_id, 1, 0)
+            self.frame_count += 1
+        return None
+
+    def _process(self) -> None:
+        """Send the grabbed frame on, if the scheduler wants one from this camera."""
+        camera_id, cfg, cap, store, ring = (self.camera_id, self.cfg, self.cap,
+                                            self.store, self.ring)
+        replay, tiled, fps = self.replay, self.tiled, self.fps
+        # After pacing: file sources are read ahead of the wall clock (a
+        # whole GOP ahead for keyframes), which mustn't count as staleness
+        captured = time.monotonic()
+
+        frame = None
+        due   = _scheduler.due(camera_id)
+        if not replay:
+            if due:
+                # Decode straight into a ring slot; the slot travels with the frame
+                bufs = ring.acquire()
+                due, frame = cap.retrieve(bufs.get("src"))
+                if due:
+                    bufs.keep("src", frame)
+                else:
+                    bufs.release()
+            _count_read(camera_id, 1, int(due))
+        if not due:
+            return
+
+        frame_idx = self.frame_count - self.frame_base - 1
+        inf_full  = None
+        if replay:
+            cached_frames = store.get(frame_idx)
+            if cached_frames is None:
+                return      # not due on the first pass — try the next one
+            h, w      = store.src_hw
+            ann_scale = ANNOTATE_WIDTH / w
+            bufs      = ring.acquire()
+            ann_frame = bufs.buffer("ann", cached_frames[0].shape)
+            np.copyto(ann_frame, cached_frames[0])    # the annotator draws on it
+            inf_full  = cached_frames[1]
+            vid_time  = frame_idx / fps
+            _count_frame_replay(camera_id)
+        else:
+            h, w = self.src_hw or frame.shape[:2]
+
+            # Two-stage resize: source → ANNOTATE_WIDTH → INFER_WIDTH
+            ann_scale = ANNOTATE_WIDTH / w
+            if frame.shape[1] == ANNOTATE_WIDTH:
+                ann_frame = frame
+            else:
+                ann_h     = int(h * ann_scale)
+                ann_frame = cv2.resize(frame, (ANNOTATE_WIDTH, ann_h),
+                                       dst=bufs.buffer("ann", (ann_h, ANNOTATE_WIDTH, 3)))
+
+            pos_msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+            vid_time = (pos_msec / 1000.0 if pos_msec or self.keyframes
+                        else (self.frame_count / fps))
+
+            if store is not None:
+                inf_full = cv2.resize(ann_frame, store.inf_hw[::-1],
+                                      dst=bufs.buffer("inf", (*store.inf_hw, 3)))
+                _frame_cache.put(store, frame_idx, ann_frame, inf_full)
+        cache_key = self.cache_key
+        cached    = _det_cache.get(cache_key, frame_idx) if cache_key else None
+        if cached is not None:
+            # Seen on an earlier pass: replay the boxes, skip the detector
+            _count_cache_hit(camera_id)
+            _route_skipped(camera_id, (ann_frame, ann_scale, cached, cfg, vid_time, None, bufs))
+            return
+
+        if self.motion_gate:
+            thumb = _motion_thumb(ann_frame)
+            still = (self.ref_thumb is not None
+                     and captured - self.last_full < MOTION_MAX_SKIP_S
+                     and _motion_score(thumb, self.ref_thumb) < MOTION_THRESHOLD)
+            _count_motion(camera_id, still)
+            if still:
+                # Nothing moved: annotate with the last detections
+                _route_skipped(camera_id, (ann_frame, ann_scale, None, cfg, vid_time, None, bufs))
+                return
+            self.ref_thumb, self.last_full = thumb, captured
+
+        inf_scale = INFER_WIDTH / ANNOTATE_WIDTH
+        if self.geom_key != (h, w):
+            ann_h       = ann_frame.shape[0]
+            self.roi    = (_roi_box(self.scenario, cfg, ANNOTATE_WIDTH, ann_h, ann_scale)
+                           if self.use_roi and not tiled else None)
+            self.origin = self.roi[:2] if self.roi else (0, 0)
+            self.ignore = _ignore_polys(cfg, ann_scale, self.origin, inf_scale)
+            if self.use_cascade:
+                self.cascade_ctx = (camera_id, _cascade_geometry(
+                    self.scenario, cfg, ann_scale, self.origin, inf_scale))
+            if tiled:
+                self.tile_geom, self.tile_xform = [], []
+                for box in _tile_grid(w, h, *self.tiles_cfg):
+                    ts = INFER_WIDTH / (box[2] - box[0])
+                    self.tile_geom.append((box, ts, _ignore_polys(cfg, 1.0, box[:2], ts)))
+                    self.tile_xform.append((box[0] * ann_scale, box[1] * ann_scale,
+                                            ann_scale / ts))
+            self.geom_key = (h, w)
+        roi, ignore = self.roi, self.ignore
+
+        if tiled:
+            # Tiles come from the source frame — that's where the detail is
+            inf_frame = []
+            for i, ((x0, y0, x1, y1), ts, polys) in enumerate(self.tile_geom):
+                th   = int((y1 - y0) * ts)
+                tile = cv2.resize(frame[y0:y1, x0:x1], (INFER_WIDTH, th),
+                                  dst=bufs.buffer(f"tile{i}", (th, INFER_WIDTH, 3)))
+                if polys:
+                    cv2.fillPoly(tile, polys, (114, 114, 114))
+                inf_frame.append(tile)
+            imgsz = INFER_WIDTH
+        elif roi is not None:
+            x0, y0, x1, y1 = roi
+            if inf_full is not None:
+                # Same crop out of the already-downscaled frame
+                inf_frame = inf_full[int(y0 * inf_scale):int(y1 * inf_scale),
+                                     int(x0 * inf_scale):int(x1 * inf_scale)]
+            else:
+                # Crop first, then downscale only the crop
+                crop      = ann_frame[y0:y1, x0:x1]
+                cw, ch    = int((x1 - x0) * inf_scale), int((y1 - y0) * inf_scale)
+                inf_frame = cv2.resize(crop, (cw, ch), dst=bufs.buffer("inf", (ch, cw, 3)))
+            imgsz     = min(INFER_WIDTH, -(-max(inf_frame.shape[:2]) // STRIDE) * STRIDE)
+        elif inf_full is not None:
+            inf_frame = inf_full
+            imgsz     = INFER_WIDTH
+        else:
+            inf_h     = int(ann_frame.shape[0] * inf_scale)
+            inf_frame = cv2.resize(ann_frame, (INFER_WIDTH, inf_h),
+                                   dst=bufs.buffer("inf", (inf_h, INFER_WIDTH, 3)))
+            imgsz     = INFER_WIDTH
+        if INFER_RECT:
+            hw    = (max(t.shape[0] for t in inf_frame), INFER_WIDTH) if tiled else inf_frame.shape[:2]
+            imgsz = _rect_imgsz(*hw, imgsz)
+        if ignore and not tiled:
+            if not inf_frame.flags.writeable:
+                # Never paint the cached frame — work on a copy in the slot
+                cached_inf, inf_frame = inf_frame, bufs.buffer("inf", inf_frame.shape)
+                np.copyto(inf_frame, cached_inf)
+            cv2.fillPoly(inf_frame, ignore, (114, 114, 114))
+
+        job = _InferJob(camera_id, inf_frame, ann_frame, ann_scale, cfg, vid_time,
+                        captured=captured,
+                        deadline=captured + self.stale_s if self.stale_s > 0 else 0.0,
+                        origin=self.origin, imgsz=imgsz,
+                        model=cfg["model"], backend=cfg["backend"],
+                        cascade=self.cascade_ctx,
+                        cache_ref=(cache_key, frame_idx) if cache_key else None,
+                        tiles=self.tile_xform if tiled else None, buffers=bufs)
+        # Registered first: the job may be routed before put() returns
+        with _outstanding_lock:
+            _outstanding[camera_id] = job
+        _scheduler.put(camera_id, job)
+
+
+def _reader_thread_fn(reader: _CameraReader):
+    """A reader on a thread of its own: step it, sleeping until it's due again."""
+    while True:
+        wake = reader.step()
+        if wake is None:
+            return
+        delay = wake - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
 
 
 # ── JPEG encode + store (hash dedup) ──────────────────────────────────────────
 
-def _encode_and_store(frame: np.ndarray, camera_id: str, lk: threading.Lock):
-    ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+def _encode_and_store(frame: np.ndarray, camera_id: str, lk: threading.Lock,
+                      bufs: FrameSlot | None = None):
+    try:
+        ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    finally:
+        if bufs is not None:
+            bufs.release()      # the frame's last user — back into the ring
     if ok:
-        b = buf.tobytes()
+        b = buf.data            # imencode's own array; no tobytes() copy
         with lk:
             _latest_frames[camera_id] = b
             _latest_hashes[camera_id] = hashlib.md5(b).digest()
@@ -390,9 +1365,11 @@ def _annotator_thread_fn(camera_id: str, scenario: str, cfg: dict,
 
     rq = _result_queues[camera_id]
     lk = _frame_locks[camera_id]
+    last_boxes = np.zeros((0, 4), dtype=np.int32)
 
     zone_pts_np      = np.array(zone, dtype=np.int32) if len(zone) >= 3 else None
     scaled_zone_list: list = []
+    ov: np.ndarray | None  = None         # zone overlay scratch, reused per frame
 
     # Initialise per-camera stats entry
     with _stats_lock:
@@ -409,6 +1386,15 @@ def _annotator_thread_fn(camera_id: str, scenario: str, cfg: dict,
             "cum_runners":      0,
             "cum_loiterers":    0,
             "frames_processed": 0,
+            "frames_stale":     0,
+            "motion_checked":   0,
+            "motion_skipped":   0,
+            "cascade_checked":  0,
+            "cascade_reasons":  {},
+            "det_cache_hits":   0,
+            "frames_from_cache": 0,
+            "frames_grabbed":   0,
+            "frames_decoded":   0,
             "total_alerts_fired": 0,
             "loop_reset":       False,
         }
@@ -419,7 +1405,7 @@ def _annotator_thread_fn(camera_id: str, scenario: str, cfg: dict,
         except queue.Empty:
             continue
 
-        ann_frame, ann_scale, results, _, vid_time = item
+        ann_frame, ann_scale, dets, _, vid_time, cache_ref, bufs = item
 
         # Check if reader signalled a video loop restart → reset event dedup
         with _stats_lock:
@@ -427,17 +1413,13 @@ def _annotator_thread_fn(camera_id: str, scenario: str, cfg: dict,
                 _camera_stats[camera_id]["loop_reset"] = False
                 event_fired.clear()
 
-        infer_to_ann = ANNOTATE_WIDTH / INFER_WIDTH
-
-        boxes_raw = []
-        for r in results:
-            if not hasattr(r, "boxes") or r.boxes is None:
-                continue
-            for box in r.boxes.xyxy:
-                x1,y1,x2,y2 = map(int, box)
-                x1=int(x1*infer_to_ann); x2=int(x2*infer_to_ann)
-                y1=int(y1*infer_to_ann); y2=int(y2*infer_to_ann)
-                boxes_raw.append((x1,y1,x2,y2))
+        # dets=None means the motion gate skipped inference — reuse last boxes
+        if dets is None:
+            boxes_raw = last_boxes
+        else:
+            boxes_raw = last_boxes = dets[:, :4].astype(np.int32)
+            if cache_ref is not None:
+                _det_cache.put(*cache_ref, dets)
 
         tracked = tracker.update(boxes_raw)
 
@@ -453,7 +1435,9 @@ def _annotator_thread_fn(camera_id: str, scenario: str, cfg: dict,
             if not scaled_zone_list:
                 scaled_zone_list = [(int(p[0]*ann_scale), int(p[1]*ann_scale)) for p in zone]
             sz = (zone_pts_np * ann_scale).astype(np.int32)
-            ov = ann_frame.copy()
+            if ov is None or ov.shape != ann_frame.shape:
+                ov = np.empty_like(ann_frame)
+            np.copyto(ov, ann_frame)
             cv2.fillPoly(ov, [sz], (0,0,180))
             cv2.addWeighted(ov, 0.18, ann_frame, 0.82, 0, ann_frame)
             cv2.polylines(ann_frame, [sz], True, (0,0,255), 1)
@@ -631,14 +1615,38 @@ def _annotator_thread_fn(camera_id: str, scenario: str, cfg: dict,
                 while cs["alerts"] and now - cs["alerts"][0] > 60:
                     cs["alerts"].popleft()
 
-        _jpeg_pool.submit(_encode_and_store, ann_frame, camera_id, lk)
+        _jpeg_pool.submit(_encode_and_store, ann_frame, camera_id, lk, bufs)
 
     print(f"[Annotator:{camera_id[:8]}] exited")
 
 
 # ── Public API ─────────────────────────────────────────────────────────────────
 
+class InvalidModelError(ValueError):
+    """A camera's model or backend can't be resolved or loaded."""
+
+
+def _check_model(cfg: dict) -> dict:
+    """
+    Resolve the camera's weights and backend and make sure they load — here
+    on the thread path, into the model store for the pool workers — so a bad
+    model is refused up front instead of failing in the shared detector.
+    """
+    try:
+        weights = resolve_weights(cfg.get("model"))
+        backend = resolve_backend(cfg.get("backend"))
+        if INFER_WORKERS > 0:
+            model_store.weights_path(weights)
+        else:
+            _get_model(weights, backend)
+    except Exception as exc:
+        raise InvalidModelError(f"Model {cfg.get('model') or 'default'} unavailable: {exc}") from exc
+    return dict(cfg, model=weights, backend=backend)
+
+
 def start(camera_id: str, scenario: str, cfg: dict) -> None:
+    """Start (or restart) a camera; InvalidModelError for a bad model, ValueError at MAX_CAMERAS."""
+    cfg = _check_model(cfg)
     _ensure_infer_thread()
 
     with _registry_lock:
@@ -656,6 +1664,21 @@ def start(camera_id: str, scenario: str, cfg: dict) -> None:
         except Exception:
             fps = 25
         cfg = dict(cfg, fps=fps)
+        reader = str(cfg.get("reader") or READER_BACKEND).strip().lower()
+        if reader not in READERS:
+            raise ValueError(f"Unknown reader '{reader}' (expected one of {READERS})")
+        # Skipping non-key frames needs the decoder — only the ffmpeg reader can
+        cfg["keyframes"] = bool(cfg.get("keyframes")) and not isinstance(video, int)
+        if cfg["keyframes"]:
+            reader, cfg["decode_every"] = "ffmpeg", 1
+        elif reader == "ffmpeg":
+            # Decimate to the fastest rate the camera can be inferred at
+            every = max(1, int(cfg.get("infer_every", 3)))
+            if _rates.enabled:
+                every = min(every, int(cfg.get("infer_every_min") or ADAPTIVE_EVERY_MIN))
+            cfg["decode_every"] = max(1, int(cfg.get("decode_every") or every))
+        cfg["reader"] = reader
+        _register_camera(camera_id, cfg)
 
         sr = threading.Event(); sa = threading.Event()
         _result_queues[camera_id]  = queue.Queue(maxsize=2)
@@ -665,9 +1688,12 @@ def start(camera_id: str, scenario: str, cfg: dict) -> None:
         _reader_stop[camera_id]    = sr
         _annotator_stop[camera_id] = sa
 
-    threading.Thread(target=_reader_thread_fn,
-                     args=(camera_id, cfg, sr),
-                     name=f"reader-{camera_id}", daemon=True).start()
+    reader = _CameraReader(camera_id, scenario, cfg, sr)
+    if _reader_engine is not None and reader.from_file:
+        _reader_engine.add(reader)
+    else:
+        threading.Thread(target=_reader_thread_fn, args=(reader,),
+                         name=reader.name, daemon=True).start()
     threading.Thread(target=_annotator_thread_fn,
                      args=(camera_id, scenario, cfg, sa),
                      name=f"annotator-{camera_id}", daemon=True).start()
@@ -676,6 +1702,9 @@ def start(camera_id: str, scenario: str, cfg: dict) -> None:
 
 
 def _stop_locked(camera_id: str):
+    _unregister_camera(camera_id)
+    if _pool is not None:
+        _pool.forget(camera_id)
     for d in (_reader_stop, _annotator_stop, _result_queues,
               _latest_frames, _frame_locks, _latest_hashes):
         d.pop(camera_id, None)
@@ -712,7 +1741,8 @@ def stop_all():
         stop(cid)
 
 
-def get_frame(camera_id: str) -> bytes | None:
+def get_frame(camera_id: str) -> memoryview | None:
+    """Latest annotated JPEG (bytes-like: concatenates and hashes like bytes)."""
     lk = _frame_locks.get(camera_id)
     if lk is None: return None
     with lk:
@@ -727,6 +1757,27 @@ def get_frame_hash(camera_id: str) -> bytes:
         return _latest_hashes.get(camera_id, b"")
 
 
+def _gate_status(camera_id: str) -> dict:
+    cs = _camera_stats.get(camera_id, {})
+    checked = cs.get("motion_checked", 0)
+    gate = {
+        "frames_stale":      cs.get("frames_stale", 0),
+        "det_cache_hits":    cs.get("det_cache_hits", 0),
+        "frames_from_cache": cs.get("frames_from_cache", 0),
+        "frames_grabbed":    cs.get("frames_grabbed", 0),
+        "frames_decoded":    cs.get("frames_decoded", 0),
+        "motion_skip_ratio": round(cs.get("motion_skipped", 0) / checked, 3) if checked else 0.0,
+    }
+    if cs.get("cascade_checked"):
+        reasons = cs["cascade_reasons"]
+        gate["cascade_escalation_ratio"] = round(sum(reasons.values()) / cs["cascade_checked"], 3)
+        gate["cascade_reasons"] = {r: reasons.get(r, 0) for r in REASONS}
+    ring = _rings.get(camera_id)
+    if ring is not None:
+        gate["frame_ring"] = {"size": ring.size, "in_use": ring.in_use(), "misses": ring.misses}
+    return gate
+
+
 def status() -> list[dict]:
     with _registry_lock:
         return [
@@ -734,6 +1785,9 @@ def status() -> list[dict]:
                 "camera_id": cid,
                 "alive":     not ev.is_set(),
                 "has_frame": bool(_latest_frames.get(cid)),
+                **_rate_status(cid),
+                **_scheduler.stats(cid),
+                **_gate_status(cid),
             }
             for cid, ev in _reader_stop.items()
         ]
@@ -0,0 +1,92 @@
+"""
+Two-stage detector cascade gate.
+
+With the cascade on, every inferred frame first goes through the light
+model (CASCADE_LIGHT, yolov8n) at a lowered confidence, and is escalated to
+the camera's own model only when the light answer is ambiguous:
+
+    conf   — a person scored in [CASCADE_CONF_LO, CASCADE_CONF_HI)
+    count  — the light person count changed since the camera's last frame
+    near   — a person's foot point is inside the zone or within CASCADE_NEAR
+             (fraction of frame width) of the zone edge / tripwire
+
+Quiet scenes with clear detections cost a nano pass; anything that could
+change an alert gets the full model. Disabled by default (CASCADE=0);
+per-camera "cascade": true/false overrides it.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+
+import cv2
+import numpy as np
+
+CASCADE         = os.getenv("CASCADE", "0").strip().lower() in ("1", "true", "yes")
+CASCADE_LIGHT   = os.getenv("CASCADE_LIGHT", "yolov8n").strip().lower()
+CASCADE_CONF_LO = float(os.getenv("CASCADE_CONF_LO", "0.15"))
+CASCADE_CONF_HI = float(os.getenv("CASCADE_CONF_HI", "0.50"))
+CASCADE_NEAR    = float(os.getenv("CASCADE_NEAR", "0.05"))
+
+REASONS = ("conf", "count", "near", "error")
+
+
+def scene_geometry(segments: list, zone: np.ndarray | None, width: int) -> tuple:
+    """
+    Pack the alert geometry of a camera, already in inference-frame coords,
+    for check(): (M, 4) segments, the zone polygon (or None) and the
+    "near" distance in pixels.
+    """
+    segs = np.array(segments, dtype=np.float32).reshape(-1, 4)
+    return segs, zone, CASCADE_NEAR * width
+
+
+def _seg_dist(pts: np.ndarray, segs: np.ndarray) -> np.ndarray:
+    """(N, 2) points × (M, 4) segments → (N,) distance to the closest segment."""
+    a, b = segs[None, :, :2], segs[None, :, 2:]
+    ab   = b - a
+    t    = np.clip(((pts[:, None] - a) * ab).sum(-1) / np.maximum((ab * ab).sum(-1), 1e-6), 0, 1)
+    d    = pts[:, None] - (a + t[..., None] * ab)
+    return np.sqrt((d * d).sum(-1)).min(axis=1)
+
+
+class CascadeGate:
+    """Per-camera escalation decision for light-model detections."""
+
+    def __init__(self):
+        self._lock   = threading.Lock()
+        self._counts: dict[str, int] = {}
+
+    def check(self, key: str, geom: tuple, det: np.ndarray, conf: float) -> str:
+        """
+        Escalation reason for light-model detections `det` ((N, 6), inference
+        coords), or "" when the light answer can be used as is. `conf` is the
+        normal detection threshold.
+        """
+        scores = det[:, 4]
+        count  = int((scores >= conf).sum())
+        with self._lock:
+            last = self._counts.get(key)
+            self._counts[key] = count
+
+        if ((scores >= CASCADE_CONF_LO) & (scores < CASCADE_CONF_HI)).any():
+            return "conf"
+        if last is not None and count != last:
+            return "count"
+
+        segs, zone, near = geom
+        if count and (len(segs) or zone is not None):
+            kept = det[scores >= conf]
+            feet = np.stack([(kept[:, 0] + kept[:, 2]) / 2, kept[:, 3]], axis=1)
+            if len(segs) and (_seg_dist(feet, segs) < near).any():
+                return "near"
+            if zone is not None and any(
+                    cv2.pointPolygonTest(zone, (float(x), float(y)), False) >= 0
+                    for x, y in feet):
+                return "near"
+        return ""
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            self._counts.pop(key, None)
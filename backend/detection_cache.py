@@ -0,0 +1,149 @@
+"""
+Detection cache for looping video-file sources.
+
+File cameras loop forever, so from the second pass on the detector would
+only recompute boxes it already produced. Detection records ((N, 5) float32
+x1, y1, x2, y2, conf in annotate-frame pixels) are cached per frame index
+under a source key made of:
+
+    - a content fingerprint of the file: size, mtime and a SHA-1 of its
+      first and last MiB
+    - a signature of everything else that shapes the detections (model,
+      backend, cascade, rect / direct inference, ROI / tiles / ignore
+      zones, widths, confidence)
+
+Readers re-stat the file at every loop; a changed size or mtime produces a
+new key, so an edited or replaced video never replays stale boxes.
+
+Memory is bounded by DET_CACHE_MAX_MB with LRU eviction of whole sources.
+With DET_CACHE_DIR set, a source's boxes are also saved as .npz once a pass
+completes and reloaded on the next start.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DET_CACHE        = os.getenv("DET_CACHE", "0").strip().lower() in ("1", "true", "yes")
+DET_CACHE_MAX_MB = float(os.getenv("DET_CACHE_MAX_MB", "64"))
+DET_CACHE_DIR    = os.getenv("DET_CACHE_DIR", "").strip()
+
+_PROBE          = 1 << 20    # bytes hashed from each end of the file
+_ENTRY_OVERHEAD = 64         # rough per-frame dict cost on top of the array
+
+
+def file_stamp(path: str) -> tuple[int, int] | None:
+    """(size, mtime_ns) of a regular file, None when it isn't one."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns) if os.path.isfile(path) else None
+
+
+def source_key(path: str, signature: dict) -> str | None:
+    """Cache key for `path` + detection `signature`, None for non-files."""
+    stamp = file_stamp(path)
+    if stamp is None:
+        return None
+    h = hashlib.sha1()
+    h.update(repr(stamp).encode())
+    with open(path, "rb") as f:
+        h.update(f.read(_PROBE))
+        if stamp[0] > 2 * _PROBE:
+            f.seek(-_PROBE, os.SEEK_END)
+            h.update(f.read(_PROBE))
+    h.update(json.dumps(signature, sort_keys=True, default=str).encode())
+    return h.hexdigest()[:24]
+
+
+class DetectionCache:
+    """Process-wide LRU of {source key: {frame index: records}}."""
+
+    def __init__(self, max_bytes: int, disk_dir: str = ""):
+        self.max_bytes = max_bytes
+        self.disk_dir  = disk_dir
+        self._lock     = threading.Lock()
+        self._sources: OrderedDict[str, dict[int, np.ndarray]] = OrderedDict()
+        self._sizes:   dict[str, int] = {}
+        self._bytes    = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.npz")
+
+    def open(self, key: str) -> None:
+        """Make `key` resident, loading a saved copy from disk if there is one."""
+        with self._lock:
+            if key in self._sources:
+                self._sources.move_to_end(key)
+                return
+        entries: dict[int, np.ndarray] = {}
+        if self.disk_dir and os.path.exists(self._path(key)):
+            try:
+                with np.load(self._path(key)) as z:
+                    entries = {int(k): z[k] for k in z.files}
+                print(f"[DetectionCache] loaded {len(entries)} frames for {key}")
+            except Exception as exc:
+                print(f"[DetectionCache] ignoring unreadable {self._path(key)}: {exc}")
+        size = sum(v.nbytes + _ENTRY_OVERHEAD for v in entries.values())
+        with self._lock:
+            if key not in self._sources:
+                self._sources[key] = entries
+                self._sizes[key]   = size
+                self._bytes       += size
+                self._evict_locked(keep=key)
+
+    def get(self, key: str, idx: int) -> np.ndarray | None:
+        src = self._sources.get(key)
+        return src.get(idx) if src is not None else None
+
+    def put(self, key: str, idx: int, boxes: np.ndarray) -> None:
+        with self._lock:
+            src = self._sources.get(key)
+            if src is None or idx in src:
+                return
+            src[idx] = boxes
+            size = boxes.nbytes + _ENTRY_OVERHEAD
+            self._sizes[key] += size
+            self._bytes      += size
+            self._sources.move_to_end(key)
+            self._evict_locked(keep=key)
+
+    def save(self, key: str) -> None:
+        """Persist a source's boxes (end of a pass) when DET_CACHE_DIR is set."""
+        if not self.disk_dir:
+            return
+        with self._lock:
+            src = dict(self._sources.get(key) or {})
+        if not src:
+            return
+        os.makedirs(self.disk_dir, exist_ok=True)
+        tmp = f"{self._path(key)}.tmp{os.getpid()}.npz"
+        np.savez(tmp, **{str(k): v for k, v in src.items()})
+        os.replace(tmp, self._path(key))
+
+    def drop(self, key: str) -> None:
+        with self._lock:
+            if self._sources.pop(key, None) is not None:
+                self._bytes -= self._sizes.pop(key)
+
+    def _evict_locked(self, keep: str) -> None:
+        # `keep` was just touched, so it sits at the MRU end
+        while self._bytes > self.max_bytes and len(self._sources) > 1:
+            victim = next(iter(self._sources))
+            self._sources.pop(victim)
+            self._bytes -= self._sizes.pop(victim)
+        # A single source over budget stops growing rather than thrashing
+        if self._bytes > self.max_bytes and keep in self._sources:
+            src = self._sources[keep]
+            while src and self._bytes > self.max_bytes:
+                _, v = src.popitem()
+                self._bytes -= v.nbytes + _ENTRY_OVERHEAD
+                self._sizes[keep] -= v.nbytes + _ENTRY_OVERHEAD
+
@@ -0,0 +1,211 @@
+"""
+FFmpeg-subprocess video reader.
+
+cv2.VideoCapture decodes every frame at full source resolution — often
+1080p or 4K — and the camera reader then resizes the frames it uses down to
+ANNOTATE_WIDTH. FFmpegCapture runs a local ffmpeg instead:
+
+    ffmpeg -i <source> -vf fps=<fps / every>,scale=<W>:<H> -pix_fmt bgr24 -f rawvideo -
+
+so frame-rate decimation and downscaling happen inside the decoder, and raw
+BGR frames are read off the pipe with readinto() into a preallocated NumPy
+buffer — no per-frame allocation for frames that end up skipped.
+
+FFmpegCapture implements the part of the cv2.VideoCapture interface the
+reader uses (isOpened, grab / retrieve / read, get, set(POS_FRAMES, 0),
+release). Properties describe the *output* stream: FPS and FRAME_COUNT are
+decimated, FRAME_WIDTH / FRAME_HEIGHT are the scaled size; `source_hw` is
+the (h, w) of the source, which zone and line coordinates refer to.
+
+Keyframes-only mode (per camera "keyframes": true) passes -skip_frame nokey
+to the decoder, which then never decodes the frames in between. Keyframes
+come at the stream's GOP interval rather than at a fixed rate, so their
+timestamps are taken from the showinfo filter's log on stderr and reported
+as POS_MSEC, relative to the first frame of the pass.
+
+Opt-in: READER_BACKEND=ffmpeg, or per camera "reader": "ffmpeg". Webcam
+indices always use cv2.VideoCapture.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import queue
+import re
+import subprocess
+import threading
+
+import cv2
+import numpy as np
+
+READER_BACKEND = os.getenv("READER_BACKEND", "opencv").strip().lower()
+FFMPEG_BIN     = os.getenv("FFMPEG_BIN", "ffmpeg")
+
+READERS = ("opencv", "ffmpeg")
+
+_PTS_RE = re.compile(rb"pts_time:\s*(-?[\d.]+)")
+
+
+class FFmpegCapture:
+    """cv2.VideoCapture look-alike fed by an ffmpeg decode/scale/decimate pipe."""
+
+    def __init__(self, source: str, width: int | None = None, every: int = 1,
+                 keyframes: bool = False):
+        """`width`: output width (height keeps the aspect), None = source size;
+        `every`: keep one source frame in `every`; `keyframes`: decode keyframes only."""
+        self.source    = source
+        self.keyframes = keyframes
+        self.every     = 1 if keyframes else max(1, every)
+        self._proc: subprocess.Popen | None = None
+        self._index = 0             # output frames grabbed since (re)start
+        self._ready = False         # _buf holds a grabbed, not yet retrieved frame
+        self._pts: queue.Queue = queue.Queue()     # keyframe timestamps from showinfo
+        self._t0    = None          # first timestamp of the pass
+        self._t     = 0.0           # current frame's time since _t0 (s)
+
+        probe = cv2.VideoCapture(source)
+        ok    = probe.isOpened()
+        self.src_fps = probe.get(cv2.CAP_PROP_FPS) or 25.0
+        src_n        = int(probe.get(cv2.CAP_PROP_FRAME_COUNT))
+        src_w        = int(probe.get(cv2.CAP_PROP_FRAME_WIDTH))
+        src_h        = int(probe.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        probe.release()
+        if not ok or not src_w or not src_h:
+            self.source_hw = None
+            return
+
+        self.source_hw = (src_h, src_w)
+        # Same rounding as the reader's cv2.resize, so both backends agree on shapes
+        self.w = width or src_w
+        self.h = int(src_h * (self.w / src_w)) if width else src_h
+        self.fps = self.src_fps / self.every
+        # A keyframe count isn't known up front
+        self.n   = -(-src_n // self.every) if src_n > 0 and not keyframes else 0
+        self._buf = np.empty((self.h, self.w, 3), dtype=np.uint8)
+        self._start()
+
+    def _start(self) -> None:
+        filters = ["showinfo"] if self.keyframes else []
+        if self.every > 1:
+            filters.append(f"fps={self.fps:.6f}")
+        if (self.h, self.w) != self.source_hw:
+            filters.append(f"scale={self.w}:{self.h}:flags=bilinear")
+        cmd = [FFMPEG_BIN, "-hide_banner", "-nostats", "-nostdin",
+               "-loglevel", "info" if self.keyframes else "error"]
+        if self.keyframes:
+            cmd += ["-skip_frame", "nokey"]
+        cmd += ["-i", self.source, "-an", "-sn", "-dn"]
+        if self.keyframes:
+            # Keep the keyframes' own timing instead of duplicating them up to
+            # a constant rate (-vsync rather than -fps_mode for ffmpeg < 5.1)
+            cmd += ["-vsync", "passthrough"]
+        if filters:
+            cmd += ["-vf", ",".join(filters)]
+        cmd += ["-pix_fmt", "bgr24", "-f", "rawvideo", "-"]
+        self._index, self._ready = 0, False
+        self._pts, self._t0, self._t = queue.Queue(), None, 0.0
+        try:
+            self._proc = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, bufsize=0,
+                stderr=subprocess.PIPE if self.keyframes else subprocess.DEVNULL)
+        except OSError as exc:
+            print(f"[FFmpegCapture] cannot start {FFMPEG_BIN}: {exc}")
+            self._proc = None
+            return
+        if self.keyframes:
+            threading.Thread(target=self._read_pts, args=(self._proc.stderr, self._pts),
+                             name="ffmpeg-pts", daemon=True).start()
+
+    @staticmethod
+    def _read_pts(stderr, out: queue.Queue) -> None:
+        """Feed showinfo's per-frame pts_time into `out` until ffmpeg exits."""
+        for line in io.BufferedReader(stderr):
+            m = _PTS_RE.search(line)
+            if m:
+                out.put(float(m.group(1)))
+        stderr.close()
+
+    def _stop(self) -> None:
+        if self._proc is None:
+            return
+        self._proc.kill()
+        self._proc.stdout.close()
+        self._proc.wait()
+        self._proc = None
+
+    def isOpened(self) -> bool:
+        return self._proc is not None
+
+    def grab(self) -> bool:
+        """Read the next frame into the buffer; False at end of stream."""
+        if self._proc is None:
+            return False
+        self._ready = False
+        view, got = memoryview(self._buf).cast("B"), 0
+        while got < len(view):
+            n = self._proc.stdout.readinto(view[got:])
+            if not n:
+                return False
+            got += n
+        self._index += 1
+        self._ready = True
+        if self.keyframes:
+            # showinfo logs a frame before it reaches the pipe
+            try:
+                t = self._pts.get(timeout=1.0)
+                self._t0 = t if self._t0 is None else self._t0
+                self._t  = t - self._t0
+            except queue.Empty:
+                pass
+        return True
+
+    def retrieve(self, image: np.ndarray | None = None) -> tuple[bool, np.ndarray | None]:
+        """Hand out the grabbed frame. Like cv2, a matching `image` is reused:
+        it becomes the buffer the next grab() fills (else a fresh one does)."""
+        if not self._ready:
+            return False, None
+        self._ready = False
+        if image is None or image.shape != self._buf.shape or image.dtype != np.uint8:
+            image = np.empty_like(self._buf)
+        frame, self._buf = self._buf, image
+        return True, frame
+
+    def read(self) -> tuple[bool, np.ndarray | None]:
+        return self.retrieve() if self.grab() else (False, None)
+
+    def get(self, prop: int) -> float:
+        if self.source_hw is None:
+            return 0.0
+        return {
+            cv2.CAP_PROP_FPS:          self.fps,
+            cv2.CAP_PROP_FRAME_COUNT:  float(self.n),
+            cv2.CAP_PROP_FRAME_WIDTH:  float(self.w),
+            cv2.CAP_PROP_FRAME_HEIGHT: float(self.h),
+            cv2.CAP_PROP_POS_FRAMES:   float(self._index),
+            cv2.CAP_PROP_POS_MSEC:     self._pos_msec(),
+        }.get(prop, 0.0)
+
+    def _pos_msec(self) -> float:
+        if self.keyframes:
+            return self._t * 1000.0
+        return (self._index - 1) * 1000.0 / self.fps if self._index else 0.0
+
+    def set(self, prop: int, value: float) -> bool:
+        """Only rewinding is supported: restarts the ffmpeg process."""
+        if prop != cv2.CAP_PROP_POS_FRAMES or value != 0 or self.source_hw is None:
+            return False
+        self._stop()
+        self._start()
+        return True
+
+    def release(self) -> None:
+        self._stop()
+
+
+def open_capture(video, reader: str = READER_BACKEND, width: int | None = None,
+                 every: int = 1, keyframes: bool = False):
+    """cv2.VideoCapture or FFmpegCapture for a camera's source."""
+    if reader == "ffmpeg" and not isinstance(video, int):
+        return FFmpegCapture(str(video), width, every, keyframes)
+    return cv2.VideoCapture(video if isinstance(video, int) else str(video))
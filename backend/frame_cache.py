@@ -0,0 +1,176 @@
+"""
+Memory-mapped decoded-frame cache for looping file sources.
+
+During the first pass over a file, every frame the reader resizes for the
+pipeline is also written — annotate-width and full infer-width — into a
+per-source file under FRAME_CACHE_DIR, laid out as two fixed-shape arrays
+indexed by frame number (sparse until written). Once a pass completes
+without running out of budget the store is marked complete, and later
+loops read frames straight from the mmap: no decoding, no resizing.
+
+Each process keeps its stores in a FRAME_CACHE_DIR/<pid> directory of its
+own — inference pool workers and other backend processes import this module
+too — and on start only clears directories whose process is gone.
+
+The total of written frames across sources is capped at FRAME_CACHE_MAX_MB.
+When a new frame doesn't fit, least recently used stores that no reader
+holds are deleted; if that is still not enough the store stops growing and
+its source simply keeps decoding.
+
+Opt-in: FRAME_CACHE=1, or per camera "frame_cache": true.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+FRAME_CACHE        = os.getenv("FRAME_CACHE", "0").strip().lower() in ("1", "true", "yes")
+FRAME_CACHE_MAX_MB = float(os.getenv("FRAME_CACHE_MAX_MB", "2048"))
+FRAME_CACHE_DIR    = os.getenv("FRAME_CACHE_DIR",
+                               os.path.join(tempfile.gettempdir(), "smart_surveillance_frames"))
+
+
+class FrameStore:
+    """One source's frames: ann (n, ah, aw, 3) and inf (n, ih, iw, 3) in one file."""
+
+    def __init__(self, path: str, n: int, src_hw: tuple, ann_shape: tuple, inf_shape: tuple):
+        self.path     = path
+        self.n        = n
+        self.src_hw   = src_hw
+        self.inf_hw   = inf_shape[:2]
+        self.stamp    = None        # file_stamp() of the source it was filled from
+        self.rec      = int(np.prod(ann_shape) + np.prod(inf_shape))
+        self.valid    = np.zeros(n, dtype=bool)
+        self.complete = False
+        self.full     = False       # refused a frame — can never complete
+        self.users    = 0
+
+        ann_bytes = n * int(np.prod(ann_shape))
+        with open(path, "wb") as f:
+            f.truncate(ann_bytes + n * int(np.prod(inf_shape)))
+        self._ann = np.memmap(path, np.uint8, "r+", 0, (n, *ann_shape))
+        self._inf = np.memmap(path, np.uint8, "r+", ann_bytes, (n, *inf_shape))
+
+    def get(self, idx: int) -> tuple[np.ndarray, np.ndarray] | None:
+        """Read-only (ann, inf) views of frame `idx`, None if it wasn't cached."""
+        if not 0 <= idx < self.n or not self.valid[idx]:
+            return None
+        ann, inf = self._ann[idx], self._inf[idx]
+        ann.flags.writeable = inf.flags.writeable = False
+        return ann, inf
+
+    def close(self) -> None:
+        del self._ann, self._inf
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass                # e.g. EPERM: someone else's, but alive
+    return True
+
+
+def _clear_orphans(root: str) -> None:
+    """Delete the store directories of processes that no longer exist."""
+    try:
+        entries = os.listdir(root)
+    except OSError:
+        return
+    for name in entries:
+        if name.isdigit() and int(name) != os.getpid() and not _pid_alive(int(name)):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+class FrameCache:
+    """Registry of FrameStores with a global byte cap and LRU eviction."""
+
+    def __init__(self, max_bytes: int, cache_dir: str):
+        self.max_bytes = max_bytes
+        self.cache_dir = os.path.join(cache_dir, str(os.getpid()))
+        self._lock     = threading.Lock()
+        self._stores: OrderedDict[str, FrameStore] = OrderedDict()
+        self._bytes    = 0
+        # Stores don't survive a restart — clear leftovers of earlier runs,
+        # but never another live process's
+        _clear_orphans(cache_dir)
+
+    def acquire(self, key: str, n: int, src_hw: tuple, ann_shape: tuple,
+                inf_shape: tuple) -> FrameStore | None:
+        """Pin (creating if needed) the store for `key`; None if it can't be made."""
+        with self._lock:
+            store = self._stores.get(key)
+            if store is None:
+                try:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    store = FrameStore(os.path.join(self.cache_dir, f"{key}.frames"),
+                                       n, src_hw, ann_shape, inf_shape)
+                except (OSError, ValueError) as exc:
+                    print(f"[FrameCache] cannot create store for {key}: {exc}")
+                    return None
+                self._stores[key] = store
+            self._stores.move_to_end(key)
+            store.users += 1
+            return store
+
+    def release(self, store: FrameStore, drop: bool = False) -> None:
+        """Unpin a store; `drop` deletes it (e.g. the source file changed)."""
+        with self._lock:
+            store.users -= 1
+            if drop and store.users <= 0:
+                self._remove_locked(store)
+
+    def put(self, store: FrameStore, idx: int, ann: np.ndarray, inf: np.ndarray) -> None:
+        if store.full or store.complete or not 0 <= idx < store.n or store.valid[idx]:
+            return
+        if ann.shape != store._ann.shape[1:] or inf.shape != store._inf.shape[1:]:
+            store.full = True       # container metadata lied about the frame size
+            return
+        with self._lock:
+            if not self._reserve_locked(store.rec):
+                store.full = True
+                return
+            self._bytes += store.rec
+        store._ann[idx] = ann
+        store._inf[idx] = inf
+        store.valid[idx] = True
+
+    def finish_pass(self, store: FrameStore) -> bool:
+        """End of a full pass: a store that never ran out of room is complete."""
+        if not store.full and store.valid.any():
+            store.complete = True
+        return store.complete
+
+    def clear(self) -> None:
+        """Delete every store (process exit)."""
+        with self._lock:
+            for store in list(self._stores.values()):
+                self._remove_locked(store)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _reserve_locked(self, need: int) -> bool:
+        for key in list(self._stores):
+            if self._bytes + need <= self.max_bytes:
+                break
+            if self._stores[key].users <= 0:
+                self._remove_locked(self._stores[key])
+        return self._bytes + need <= self.max_bytes
+
+    def _remove_locked(self, store: FrameStore) -> None:
+        for key, s in list(self._stores.items()):
+            if s is store:
+                del self._stores[key]
+        self._bytes -= int(store.valid.sum()) * store.rec
+        store.close()
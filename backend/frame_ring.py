@@ -0,0 +1,91 @@
+"""
+Per-camera preallocated frame buffers.
+
+Left alone, every frame a reader sends on allocates fresh arrays — the
+decoded frame, the annotate- and infer-size resizes — and at 100 cameras
+that is a constant churn of half-megabyte allocations. Instead each camera
+owns a FrameRing of FRAME_RING_SIZE slots. A slot holds the named buffers
+one frame needs ("src", "ann", "inf"), which the reader fills in place via
+cap.retrieve(image) and cv2.resize(dst=).
+
+The slot then travels with the frame, and whoever ends the frame's trip
+gives it back with release():
+
+    reader         a frame it can't send on after all
+    scheduler      superseded and stale jobs
+    _route_result  results dropped off a full annotator queue
+    JPEG encoder   once the annotated frame is encoded
+
+When every slot is still in flight, acquire() hands out a detached slot
+backed by fresh arrays (counted as a miss) rather than blocking the reader,
+and a slot whose release was missed only shrinks the ring. Opt out with
+FRAME_RING_SIZE=0.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+
+import numpy as np
+
+FRAME_RING_SIZE = max(0, int(os.getenv("FRAME_RING_SIZE", "6")))
+
+
+class FrameSlot:
+    """Named frame buffers reused from one frame to the next."""
+
+    __slots__ = ("_ring", "_bufs", "busy")
+
+    def __init__(self, ring: FrameRing | None):
+        self._ring = ring               # None: detached, never returned
+        self._bufs: dict[str, np.ndarray] = {}
+        self.busy  = False
+
+    def get(self, name: str) -> np.ndarray | None:
+        return self._bufs.get(name)
+
+    def buffer(self, name: str, shape: tuple) -> np.ndarray:
+        """The `name` buffer as a uint8 array of `shape`, reallocated only if it changed."""
+        buf = self._bufs.get(name)
+        if buf is None or buf.shape != shape:
+            buf = self._bufs[name] = np.empty(shape, dtype=np.uint8)
+        return buf
+
+    def keep(self, name: str, arr: np.ndarray) -> np.ndarray:
+        """Adopt `arr` (e.g. what cap.retrieve returned) as the `name` buffer."""
+        self._bufs[name] = arr
+        return arr
+
+    def release(self) -> None:
+        if self._ring is not None:
+            self._ring._release(self)
+
+
+class FrameRing:
+    """A camera's FrameSlots; acquire() never blocks."""
+
+    def __init__(self, size: int = FRAME_RING_SIZE):
+        self._lock   = threading.Lock()
+        self._free   = [FrameSlot(self) for _ in range(size)]
+        self.size    = size
+        self.misses  = 0
+
+    def acquire(self) -> FrameSlot:
+        with self._lock:
+            if self._free:
+                slot = self._free.pop()
+                slot.busy = True
+                return slot
+            self.misses += self.size > 0
+        return FrameSlot(None)
+
+    def _release(self, slot: FrameSlot) -> None:
+        with self._lock:
+            if slot.busy:               # releasing twice must not free it twice
+                slot.busy = False
+                self._free.append(slot)
+
+    def in_use(self) -> int:
+        with self._lock:
+            return self.size - len(self._free)
@@ -0,0 +1,379 @@
+"""
+Multi-process inference worker pool with shared-memory frame handoff.
+
+Each worker process loads the detector once. Inference-sized frames are
+copied straight into a slot of one shared-memory block, so only
+(job_id, slot, h, w, deadline, imgsz, model, extra) goes to a worker and
+only a compact (N, 6) float32 array [x1, y1, x2, y2, conf, cls] comes back —
+no frame pickling. The rare frame bigger than a slot (a very tall source)
+travels pickled in place of its slot index instead of being dropped.
+
+On start each worker runs warmup(loader) — or just loader() — and reports
+back; wait_ready() blocks until every worker has, and ready_info() holds
+what each warmup returned (e.g. timings).
+
+Workers call predict(loader, frames, imgsz, model, extras) → (results, notes)
+once per (imgsz, model) group of a batch; each note is handed to on_result
+alongside the boxes.
+
+Cameras are sharded: the first frame of a camera pins it to the worker with
+the fewest cameras (ties go to a worker that already has the camera's model
+loaded), which keeps per-camera results in order.
+
+Each worker takes at most `depth` (2 x batch_size) frames in flight, and
+each camera one job (its frame, or its tiles). The dispatcher only takes a
+camera's frame off the scheduler once has_capacity() says both have room,
+then stage()s it into
+a slot and dispatch()es it — so worker queues never build a backlog, a busy
+camera's frames are superseded in the scheduler rather than queued, and
+frame selection stays with the scheduler. on_free() is called whenever a
+worker's capacity frees up.
+
+A model that fails to load or predict fails only its own group's frames:
+they come back as empty boxes. A worker process that dies is restarted by
+the collector, and its outstanding jobs are failed the same way.
+"""
+
+from __future__ import annotations
+
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Callable
+
+import numpy as np
+
+
+def compact_results(res) -> np.ndarray:
+    """Results (or an (N, 6) array) → (N, 6) float32 array; empty on failure/no boxes."""
+    if isinstance(res, np.ndarray):
+        return res.astype(np.float32, copy=False)
+    if res is None or getattr(res, "boxes", None) is None:
+        return np.zeros((0, 6), dtype=np.float32)
+    return res.boxes.data.cpu().numpy().astype(np.float32, copy=False)
+
+
+def _worker_main(idx: int, shm_name: str, slots_shape: tuple,
+                 tasks, results, loader: Callable, predict: Callable,
+                 batch_size: int, wait_ms: float, threads: int,
+                 warmup: Callable | None = None):
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except Exception:
+        pass
+
+    # Spawned workers share the parent's resource tracker, so attaching here
+    # does not hand ownership of the block away from the parent.
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray(slots_shape, dtype=np.uint8, buffer=shm.buf)
+
+    # Default model (warmed up if asked to); others load on first use. A
+    # model that fails to load here fails its jobs later, not the worker.
+    info = None
+    try:
+        if warmup is not None:
+            info = warmup(loader)
+        else:
+            loader()
+    except Exception as exc:
+        print(f"[InferWorker:{idx}] warmup failed: {exc!r}")
+        info = {"error": repr(exc)}
+    results.put(("ready", idx, info))
+    print(f"[InferWorker:{idx}] running  pid={os.getpid()} threads={threads}")
+
+    running = True
+    while running:
+        first = tasks.get()
+        if first is None:
+            break
+        batch    = [first]
+        deadline = time.perf_counter() + wait_ms / 1000.0
+        while len(batch) < batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                task = tasks.get(timeout=remaining) if remaining > 0 else tasks.get_nowait()
+            except queue.Empty:
+                break
+            if task is None:
+                running = False
+                break
+            batch.append(task)
+
+        # Frames that went stale while queued here are reported, not inferred
+        now   = time.monotonic()
+        fresh = []
+        for task in batch:
+            if task[4] and now > task[4]:
+                results.put((task[0], "stale", None))
+            else:
+                fresh.append(task)
+        if not fresh:
+            continue
+
+        groups: dict[tuple, list] = {}
+        for task in fresh:
+            groups.setdefault(task[5:7], []).append(task)
+        for (imgsz, model), tasks_ in groups.items():
+            views = [frames[slot, :h, :w] if isinstance(slot, int) else slot
+                     for _, slot, h, w, *_ in tasks_]
+            try:
+                out, notes = predict(loader, views, imgsz, model, [t[7] for t in tasks_])
+            except Exception as exc:
+                # Loading or running this group's model failed — its frames
+                # come back empty, like a failed predict() on the thread path
+                print(f"[InferWorker:{idx}] {model or 'default model'} failed: {exc!r}")
+                out   = [None] * len(tasks_)
+                notes = [None if t[7] is None else "error" for t in tasks_]
+            del views
+            for task, res, note in zip(tasks_, out, notes):
+                results.put((task[0], note, compact_results(res)))
+
+    del frames
+    shm.close()
+
+
+class InferencePool:
+    """Pool of detector processes fed through shared-memory frame slots."""
+
+    def __init__(self, workers: int, n_slots: int, slot_h: int, slot_w: int,
+                 loader: Callable, predict: Callable, on_result: Callable,
+                 batch_size: int = 1, wait_ms: float = 10.0,
+                 warmup: Callable | None = None, on_free: Callable | None = None):
+        self.workers    = workers
+        self.slot_h     = slot_h
+        self.slot_w     = slot_w
+        self._on_result = on_result
+        self._on_free   = on_free
+        # Enough in flight to keep each worker's next batch queued up
+        self.depth      = batch_size * 2
+        self._batch_size = batch_size
+        self._inflight  = [0] * workers
+        self._cam_inflight: dict[str, int] = {}     # camera_id → frames in flight
+
+        shape     = (n_slots, slot_h, slot_w, 3)
+        self._shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        self._frames = np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf)
+
+        # A LIFO stack: the same few slots are reused, so only the pages of
+        # as many slots as are ever in flight at once get touched
+        self._free: list[int] = list(range(n_slots - 1, -1, -1))
+
+        self._lock     = threading.Lock()
+        self._pending: dict[int, tuple] = {}          # job_id → (slot, camera_id, meta, worker)
+        self._shard:   dict[str, int]   = {}          # camera_id → worker index
+        self._load     = [0] * workers
+        self._loaded   = [set() for _ in range(workers)]   # models each worker has loaded
+        self._job_ids  = itertools.count()
+        self._ready:   dict[int, object] = {}         # worker index → warmup() result
+        self._all_ready = threading.Event()
+        # Frames sent pickled (too big for a slot) / dropped for want of a free slot
+        self._inline   = 0
+        self._no_slot  = 0
+
+        self._ctx     = mp.get_context("spawn")
+        self._results = self._ctx.Queue()
+        threads       = max(1, (os.cpu_count() or 1) // workers)
+        self._worker_args = (shape, loader, predict, batch_size, wait_ms, threads, warmup)
+        self._tasks:  list = [None] * workers
+        self._procs:  list = [None] * workers
+        self._closing = False
+        self.restarts = 0
+        for i in range(workers):
+            self._spawn(i)
+
+        self._collector = threading.Thread(target=self._collect_loop,
+                                           name="infer-collector", daemon=True)
+        self._collector.start()
+
+    def _spawn(self, i: int) -> None:
+        """Start worker `i` on a fresh task queue."""
+        shape, loader, predict, batch_size, wait_ms, threads, warmup = self._worker_args
+        self._tasks[i] = self._ctx.Queue()
+        self._procs[i] = self._ctx.Process(
+            target=_worker_main,
+            args=(i, self._shm.name, shape, self._tasks[i], self._results,
+                  loader, predict, batch_size, wait_ms, threads, warmup),
+            name=f"infer-worker-{i}", daemon=True,
+        )
+        self._procs[i].start()
+
+    # ── Sharding ──────────────────────────────────────────────────────────────
+
+    def _worker_for(self, camera_id: str, model: str | None = None) -> int:
+        w = self._shard.get(camera_id)
+        if w is None:
+            # Least loaded; on a tie prefer a worker that already holds the model
+            w = min(range(self.workers),
+                    key=lambda i: (self._load[i], model not in self._loaded[i]))
+            self._shard[camera_id] = w
+            self._load[w] += 1
+            self._loaded[w].add(model)
+        return w
+
+    def has_capacity(self, camera_id: str, model: str | None = None, n: int = 1) -> bool:
+        """
+        Can the camera send a job of `n` frames now? Not while its previous
+        job is in flight; otherwise if its worker has room for it, or for one
+        batch if the job is bigger — waiting for the worker to drain would
+        starve a tiled camera behind single-frame ones that keep it busy.
+        """
+        with self._lock:
+            if self._cam_inflight.get(camera_id):
+                return False
+            busy = self._inflight[self._worker_for(camera_id, model)]
+            return busy + min(n, self._batch_size) <= self.depth
+
+    def forget(self, camera_id: str) -> None:
+        """Drop a camera's shard assignment (called when it stops)."""
+        with self._lock:
+            w = self._shard.pop(camera_id, None)
+            if w is not None:
+                self._load[w] -= 1
+
+    # ── Submit / collect ──────────────────────────────────────────────────────
+
+    def stage(self, frame: np.ndarray) -> int | np.ndarray | None:
+        """
+        Copy `frame` into a free slot and return its index, or None (frame
+        dropped) when no slot is free. A frame that doesn't fit a slot is
+        returned as a contiguous copy to be sent pickled instead.
+        """
+        h, w = frame.shape[:2]
+        if h > self.slot_h or w > self.slot_w:
+            with self._lock:
+                self._inline += 1
+            return np.ascontiguousarray(frame)
+        with self._lock:
+            if not self._free:
+                self._no_slot += 1
+                return None
+            slot = self._free.pop()
+        self._frames[slot, :h, :w] = frame
+        return slot
+
+    def release(self, slot: int | np.ndarray) -> None:
+        """Return a staged slot that will never be dispatched."""
+        if isinstance(slot, int):
+            with self._lock:
+                self._free.append(slot)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"slots": len(self._frames), "slots_free": len(self._free),
+                    "inflight": list(self._inflight), "inline": self._inline,
+                    "no_slot": self._no_slot, "restarts": self.restarts}
+
+    def dispatch(self, camera_id: str, slot: int | np.ndarray, h: int, w: int, meta: tuple,
+                 deadline: float = 0.0, imgsz: int | tuple = 640, model: str | None = None,
+                 extra=None) -> None:
+        """
+        Queue a staged slot on the camera's worker (check has_capacity() first).
+        A non-zero time.monotonic() `deadline` lets the worker skip it if late;
+        on_result then gets boxes=None. `imgsz`, `model` and the picklable
+        `extra` are passed through to predict().
+        """
+        with self._lock:
+            job_id = next(self._job_ids)
+            worker = self._worker_for(camera_id, model)
+            self._pending[job_id] = (slot, camera_id, meta, worker)
+            self._inflight[worker] += 1
+            self._cam_inflight[camera_id] = self._cam_inflight.get(camera_id, 0) + 1
+            # Under the lock: a restarted worker gets a new queue (_reap)
+            self._tasks[worker].put((job_id, slot, h, w, deadline, imgsz, model, extra))
+
+    def _finish(self, job_id: int) -> tuple | None:
+        """Retire a job and free its slot and capacity (call with _lock held)."""
+        entry = self._pending.pop(job_id, None)
+        if entry is not None:
+            if isinstance(entry[0], int):
+                self._free.append(entry[0])
+            self._inflight[entry[3]] -= 1
+            left = self._cam_inflight.pop(entry[1], 1) - 1
+            if left:
+                self._cam_inflight[entry[1]] = left
+        return entry
+
+    def _reap(self) -> None:
+        """
+        Restart workers that died. Their outstanding jobs can never complete,
+        so they are failed — empty boxes, like a failed predict() — which
+        frees their cameras to send again.
+        """
+        for i, p in enumerate(self._procs):
+            if p.is_alive() or self._closing:
+                continue
+            print(f"[InferencePool] worker {i} died (exit code {p.exitcode}), restarting it")
+            with self._lock:
+                lost = [self._finish(job_id) for job_id, entry in list(self._pending.items())
+                        if entry[3] == i]
+                old = self._tasks[i]
+                self._loaded[i].clear()
+                self._spawn(i)
+                self.restarts += 1
+            old.close()
+            old.cancel_join_thread()
+            if lost and self._on_free is not None:
+                self._on_free()
+            for _, camera_id, meta, _ in lost:
+                try:
+                    self._on_result(camera_id, compact_results(None), meta, None)
+                except Exception as exc:
+                    print(f"[InferencePool] result routing error: {exc}")
+
+    def _collect_loop(self):
+        next_check = time.monotonic() + 1.0
+        while True:
+            if time.monotonic() >= next_check:
+                self._reap()
+                next_check = time.monotonic() + 1.0
+            try:
+                job_id, note, boxes = self._results.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            if job_id == "ready":
+                self._ready[note] = boxes
+                if len(self._ready) == self.workers:
+                    self._all_ready.set()
+                continue
+            if job_id is None:
+                break
+            with self._lock:
+                entry = self._finish(job_id)
+            if entry is None:
+                continue
+            _, camera_id, meta, _ = entry
+            if self._on_free is not None:
+                self._on_free()
+            try:
+                self._on_result(camera_id, boxes, meta, note)
+            except Exception as exc:
+                print(f"[InferencePool] result routing error: {exc}")
+
+    # ── Readiness ─────────────────────────────────────────────────────────────
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Block until every worker has loaded (and warmed up) its model."""
+        return self._all_ready.wait(timeout)
+
+    def ready_info(self) -> dict[int, object]:
+        return dict(self._ready)
+
+    def close(self) -> None:
+        self._closing = True
+        for q in self._tasks:
+            q.put(None)
+        for p in self._procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        self._results.put((None, None, None))
+        del self._frames
+        self._shm.close()
+        self._shm.unlink()
@@ -0,0 +1,220 @@
+"""
+Fair per-camera inference scheduler.
+
+Replaces the single global FIFO: every camera owns exactly one slot holding
+its most recent frame, so a busy camera can only ever overwrite its own
+pending frame, never crowd out another camera's.
+
+Slots are served by weighted fair queuing — each camera has a virtual clock
+that advances by 1/weight every time it is served and the ready camera with
+the smallest clock goes next. Equal weights give plain round-robin.
+
+Each camera also has a minimum interval between offered frames; readers ask
+due() before they bother resizing a frame. That is where the per-camera
+`infer_every` setting lives now.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Callable
+
+
+class _CameraSlot:
+    __slots__ = ("weight", "interval", "slack", "next_due", "vtime",
+                 "pending", "offered", "served", "superseded")
+
+    def __init__(self, weight: float, interval: float, slack: float, vtime: float):
+        self.weight     = weight
+        self.interval   = interval
+        self.slack      = slack
+        self.next_due   = 0.0
+        self.vtime      = vtime
+        self.pending    = None
+        self.offered    = 0
+        self.served     = 0
+        self.superseded = 0
+
+
+class FrameScheduler:
+    """Latest-frame-per-camera scheduler with weighted fair share."""
+
+    def __init__(self, on_drop: Callable | None = None):
+        self._cv      = threading.Condition()
+        self._cams:  dict[str, _CameraSlot] = {}
+        self._ready: set[str] = set()
+        self._vclock  = 0.0
+        self._closed  = False
+        self._on_drop = on_drop
+
+    # ── Registration ──────────────────────────────────────────────────────────
+
+    def register(self, camera_id: str, weight: float = 1.0,
+                 interval: float = 0.0, slack: float = 0.0) -> None:
+        """
+        weight   : relative share of inference capacity under contention
+        interval : minimum seconds between frames offered by this camera
+        slack    : early tolerance for due() so pacing jitter can't skip a frame
+        """
+        with self._cv:
+            old = self._cams.pop(camera_id, None)
+            self._ready.discard(camera_id)
+            # New cameras start at the current clock — no catch-up burst
+            self._cams[camera_id] = _CameraSlot(max(weight, 1e-6), interval,
+                                                slack, self._vclock)
+        if old is not None and old.pending is not None:
+            self._drop(old.pending)
+
+    def update(self, camera_id: str, weight: float | None = None,
+               interval: float | None = None) -> None:
+        """Retune a registered camera's share and/or rate limit in place."""
+        with self._cv:
+            cam = self._cams.get(camera_id)
+            if cam is None:
+                return
+            if weight is not None:
+                cam.weight = max(weight, 1e-6)
+            if interval is not None:
+                cam.next_due += interval - cam.interval
+                cam.interval  = interval
+
+    def unregister(self, camera_id: str) -> None:
+        with self._cv:
+            cam = self._cams.pop(camera_id, None)
+            self._ready.discard(camera_id)
+        if cam is not None and cam.pending is not None:
+            self._drop(cam.pending)
+
+    def _drop(self, item) -> None:
+        if self._on_drop is not None:
+            self._on_drop(item)
+
+    # ── Producer side ─────────────────────────────────────────────────────────
+
+    def due(self, camera_id: str, now: float | None = None) -> bool:
+        """True when the camera's rate limit allows offering another frame."""
+        cam = self._cams.get(camera_id)
+        if cam is None:
+            return False
+        now = time.perf_counter() if now is None else now
+        return now + cam.slack >= cam.next_due
+
+    def skip(self, camera_id: str, now: float | None = None) -> None:
+        """Consume the camera's current due slot without offering a frame."""
+        cam = self._cams.get(camera_id)
+        if cam is not None:
+            cam.next_due = (time.perf_counter() if now is None else now) + cam.interval
+
+    def put(self, camera_id: str, item, now: float | None = None) -> bool:
+        """Store `item` as the camera's latest frame, replacing any unserved one."""
+        now = time.perf_counter() if now is None else now
+        dropped = None
+        with self._cv:
+            cam = self._cams.get(camera_id)
+            if cam is None or self._closed:
+                dropped = item
+            else:
+                if cam.pending is not None:
+                    cam.superseded += 1
+                    dropped = cam.pending
+                cam.pending  = item
+                cam.offered += 1
+                cam.next_due = now + cam.interval
+                self._ready.add(camera_id)
+                self._cv.notify()
+        if dropped is not None:
+            self._drop(dropped)
+        return dropped is not item
+
+    # ── Consumer side ─────────────────────────────────────────────────────────
+
+    def _pop_locked(self, ready=None):
+        cid = min(ready or self._ready, key=lambda c: self._cams[c].vtime)
+        cam = self._cams[cid]
+        self._ready.discard(cid)
+        item, cam.pending = cam.pending, None
+        cam.served  += 1
+        # An idle camera's stale clock wins once, then it rejoins the current round
+        self._vclock = max(self._vclock, cam.vtime)
+        cam.vtime    = self._vclock + 1.0 / cam.weight
+        return item
+
+    def get(self, timeout: float | None = None, accept: Callable | None = None):
+        """
+        Next frame by fair share. With `accept`, only cameras for which
+        accept(camera_id, item) is true are served — the others keep their
+        slot (and keep superseding it); call wake() when the answer may have
+        changed. Raises queue.Empty on timeout and returns None once the
+        scheduler is closed.
+        """
+        ready: set[str] = set()
+
+        def servable() -> bool:
+            nonlocal ready
+            ready = (self._ready if accept is None else
+                     {c for c in self._ready if accept(c, self._cams[c].pending)})
+            return bool(ready) or self._closed
+
+        with self._cv:
+            if not self._cv.wait_for(servable, timeout):
+                raise queue.Empty
+            if self._closed:
+                return None
+            return self._pop_locked(ready)
+
+    def wake(self) -> None:
+        """Re-evaluate get()'s `accept` for waiting consumers."""
+        with self._cv:
+            self._cv.notify_all()
+
+    def get_batch(self, max_items: int, wait_s: float,
+                  timeout: float | None = None, key: Callable | None = None) -> list | None:
+        """
+        Block for the first frame, then keep taking frames until `max_items`
+        or `wait_s` elapses. With `key`, only frames whose key(item) matches
+        the first one's join the batch; the others stay queued for the next.
+        Returns [] on timeout and None once closed.
+        """
+        try:
+            first = self.get(timeout)
+        except queue.Empty:
+            return []
+        if first is None:
+            return None
+
+        batch    = [first]
+        want     = key(first) if key is not None else None
+        deadline = time.perf_counter() + wait_s
+        with self._cv:
+            while len(batch) < max_items and not self._closed:
+                ready = self._ready
+                if key is not None:
+                    ready = {c for c in ready if key(self._cams[c].pending) == want}
+                if not ready:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0 or not self._cv.wait(remaining):
+                        break
+                    continue
+                batch.append(self._pop_locked(ready))
+        return batch
+
+    def close(self) -> None:
+        with self._cv:
+            self._closed = True
+            self._cv.notify_all()
+
+    # ── Introspection ─────────────────────────────────────────────────────────
+
+    def stats(self, camera_id: str) -> dict:
+        with self._cv:
+            cam = self._cams.get(camera_id)
+            if cam is None:
+                return {}
+            return {
+                "weight":            round(cam.weight, 3),
+                "frames_offered":    cam.offered,
+                "frames_inferred":   cam.served,
+                "frames_superseded": cam.superseded,
+            }
@@ -0,0 +1,141 @@
+"""
+Closed-loop adaptive infer_every controller.
+
+Every ADAPTIVE_PERIOD_S the controller looks at three signals:
+
+    wait  — per-camera EMA of capture → dequeue time (scheduler queueing)
+    lag   — per-camera EMA of capture → result time (end-to-end processing)
+    cpu   — node CPU utilisation (psutil, or load average / cores)
+
+and moves each camera's effective infer_every one step within its bounds:
+up when the node or that camera is behind, down when there is clear
+headroom. Hysteresis between the high and low thresholds keeps it from
+oscillating. The new value is handed to an `apply` callback.
+
+Disabled by default — with ADAPTIVE_INFER unset the controller only records
+the static infer_every of each camera for status reporting.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+ADAPTIVE_INFER     = os.getenv("ADAPTIVE_INFER", "0").strip().lower() in ("1", "true", "yes")
+ADAPTIVE_PERIOD_S  = float(os.getenv("ADAPTIVE_PERIOD_S", "2.0"))
+ADAPTIVE_EVERY_MIN = int(os.getenv("ADAPTIVE_EVERY_MIN", "1"))
+ADAPTIVE_EVERY_MAX = int(os.getenv("ADAPTIVE_EVERY_MAX", "8"))
+ADAPTIVE_WAIT_MS   = float(os.getenv("ADAPTIVE_WAIT_MS", "100"))
+ADAPTIVE_LAG_MS    = float(os.getenv("ADAPTIVE_LAG_MS", "300"))
+ADAPTIVE_CPU_HIGH  = float(os.getenv("ADAPTIVE_CPU_HIGH", "0.85"))
+ADAPTIVE_CPU_LOW   = float(os.getenv("ADAPTIVE_CPU_LOW", "0.60"))
+
+_EMA_A = 0.2
+
+
+def cpu_load() -> float:
+    """Node CPU utilisation in [0, 1+]."""
+    if psutil is not None:
+        return psutil.cpu_percent(interval=None) / 100.0
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return 0.0
+
+
+class _CameraRate:
+    __slots__ = ("every", "lo", "hi", "wait", "lag")
+
+    def __init__(self, every: int, lo: int, hi: int):
+        self.every = every
+        self.lo    = lo
+        self.hi    = hi
+        self.wait  = 0.0
+        self.lag   = 0.0
+
+
+class AdaptiveRateController:
+    """Per-camera infer_every controller driven by wait, lag and CPU load."""
+
+    def __init__(self, apply: Callable[[str, int], None], enabled: bool = ADAPTIVE_INFER):
+        self.enabled  = enabled
+        self._apply   = apply
+        self._lock    = threading.Lock()
+        self._cams: dict[str, _CameraRate] = {}
+        self._started = False
+        self.last_cpu = 0.0
+
+    def register(self, camera_id: str, every: int,
+                 lo: int | None = None, hi: int | None = None) -> None:
+        lo = max(1, ADAPTIVE_EVERY_MIN if lo is None else lo)
+        hi = max(lo, ADAPTIVE_EVERY_MAX if hi is None else hi)
+        if self.enabled:
+            every = min(max(every, lo), hi)
+        with self._lock:
+            self._cams[camera_id] = _CameraRate(every, lo, hi)
+        if self.enabled:
+            self._ensure_thread()
+
+    def unregister(self, camera_id: str) -> None:
+        with self._lock:
+            self._cams.pop(camera_id, None)
+
+    def effective(self, camera_id: str) -> int | None:
+        cam = self._cams.get(camera_id)
+        return cam.every if cam is not None else None
+
+    def observe(self, camera_id: str, wait_s: float | None = None,
+                lag_s: float | None = None) -> None:
+        cam = self._cams.get(camera_id)
+        if cam is None or not self.enabled:
+            return
+        if wait_s is not None:
+            cam.wait += _EMA_A * (wait_s - cam.wait)
+        if lag_s is not None:
+            cam.lag += _EMA_A * (lag_s - cam.lag)
+
+    # ── Control loop ──────────────────────────────────────────────────────────
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        cpu_load()   # prime psutil's interval counter
+        threading.Thread(target=self._loop, name="rate-controller", daemon=True).start()
+
+    def step(self) -> None:
+        """One control decision for every camera."""
+        cpu = self.last_cpu = cpu_load()
+        wait_hi, lag_hi = ADAPTIVE_WAIT_MS / 1000.0, ADAPTIVE_LAG_MS / 1000.0
+        changed = []
+        with self._lock:
+            for cid, cam in self._cams.items():
+                if cpu > ADAPTIVE_CPU_HIGH or cam.wait > wait_hi or cam.lag > lag_hi:
+                    new = min(cam.hi, cam.every + 1)
+                elif cpu < ADAPTIVE_CPU_LOW and cam.wait < wait_hi / 2 and cam.lag < lag_hi / 2:
+                    new = max(cam.lo, cam.every - 1)
+                else:
+                    continue
+                if new != cam.every:
+                    cam.every = new
+                    changed.append((cid, new))
+        for cid, every in changed:
+            self._apply(cid, every)
+
+    def _loop(self) -> None:
+        print(f"[RateController] running  period={ADAPTIVE_PERIOD_S}s "
+              f"bounds={ADAPTIVE_EVERY_MIN}..{ADAPTIVE_EVERY_MAX}")
+        while True:
+            time.sleep(ADAPTIVE_PERIOD_S)
+            try:
+                self.step()
+            except Exception as exc:
+                print(f"[RateController] error: {exc}")
@@ -0,0 +1,108 @@
+"""
+Shared reader engine: many camera readers on a few threads.
+
+By default every camera gets its own reader thread, which spends almost all
+of its life in time.sleep() waiting for its next frame's due time — at 100
+cameras that is 100 threads waking up 25 times a second each, with a GIL
+handoff and a context switch per wake-up.
+
+ReaderEngine serves every registered source from a fixed pool of
+READER_WORKERS threads instead. Sources sit in one timer heap ordered by
+the time they next want to run; an idle worker pops the earliest one once
+it is due, calls its step() and pushes it back with the deadline step()
+returned (None: the source is done). A source is never on the heap while a
+worker is running it, so each source's state is only ever touched by one
+thread at a time.
+
+step() must not block for long: a worker stuck in one source delays every
+other source behind it. Readers whose reads block until the next frame
+arrives (webcams, network streams) therefore keep a dedicated thread.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import threading
+import time
+
+_workers_env   = os.getenv("READER_WORKERS", "0").strip().lower()
+READER_WORKERS = (min(8, os.cpu_count() or 1) if _workers_env == "auto"
+                  else max(0, int(_workers_env)))
+
+# Sources due within this of now run in the same wake-up, like timer slack:
+# a frame a couple of ms early is well inside the scheduler's pacing slack
+_SLACK_S = 0.002
+
+
+class ReaderEngine:
+    """
+    Timer-heap scheduler for sources on a small worker pool. A source has a
+    `name`, step() — one unit of work, returning the time.perf_counter()
+    at which to run again or None when done — and close(), called instead
+    if step() raises.
+    """
+
+    def __init__(self, workers: int = READER_WORKERS):
+        self._cv      = threading.Condition()
+        self._heap: list[tuple[float, int, object]] = []
+        self._seq     = itertools.count()     # FIFO among equal deadlines
+        self._workers = max(1, workers)
+        self._threads: list[threading.Thread] = []
+        self._running = 0                     # sources inside step() right now
+        self._steps   = 0
+        self._late_s  = 0.0                   # summed lateness of those steps
+
+    def add(self, source) -> None:
+        """Schedule `source` to step as soon as a worker is free."""
+        with self._cv:
+            if not self._threads:
+                # Workers start with the first source
+                for i in range(self._workers):
+                    t = threading.Thread(target=self._worker, name=f"reader-engine-{i}",
+                                         daemon=True)
+                    t.start()
+                    self._threads.append(t)
+            heapq.heappush(self._heap, (time.perf_counter(), next(self._seq), source))
+            self._cv.notify()
+
+    def _worker(self) -> None:
+        while True:
+            with self._cv:
+                while True:
+                    now = time.perf_counter()
+                    if self._heap and self._heap[0][0] <= now + _SLACK_S:
+                        due, _, source = heapq.heappop(self._heap)
+                        break
+                    self._cv.wait(self._heap[0][0] - now if self._heap else None)
+                self._running += 1
+                self._steps   += 1
+                self._late_s  += max(0.0, now - due)
+                if self._heap and self._heap[0][0] <= now + _SLACK_S:
+                    self._cv.notify()       # more is due — wake another worker
+            try:
+                wake = source.step()
+            except Exception as exc:
+                print(f"[ReaderEngine] {source.name} failed, dropping it: {exc!r}")
+                wake = None
+                try:
+                    source.close()
+                except Exception:
+                    pass
+            with self._cv:
+                self._running -= 1
+                if wake is not None:
+                    heapq.heappush(self._heap, (wake, next(self._seq), source))
+                    # Only the new earliest deadline can shorten a worker's wait
+                    if self._heap[0][2] is source:
+                        self._cv.notify()
+
+    def stats(self) -> dict:
+        with self._cv:
+            return {
+                "workers": len(self._threads),
+                "sources": len(self._heap) + self._running,
+                "steps":   self._steps,
+                "mean_late_ms": round(self._late_s * 1000 / self._steps, 2) if self._steps else 0.0,
+            }
@@ -5,13 +5,13 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(PROJECT_ROOT)
 
 
-import cv2
 import json
 import os
 from fastapi import Request
-from scenarios.behavior import run as behavior_run
-from scenarios.line_crossing import run as metro_run
-from scenarios.zone_detection import run as zone_run
+
+# cv2 and the scenario pipelines (torch / ultralytics) are imported inside
+# frame_generator, when a stream actually starts — importing this module
+# must stay cheap for the API process.
 
 
 # simple in-memory registry of stop signals keyed by token.  the
@@ -39,6 +39,7 @@ async def frame_generator(
     token: str | None = None,
 ):
     """Asynchronous generator that yields MJPEG frames until client disconnects."""
+    import cv2
 
     config_map = {
         "metro_line":     "config/metro_line.json",
@@ -93,10 +94,13 @@ async def frame_generator(
     # choose pipeline
     try:
         if scenario == "behavior":
+            from scenarios.behavior import run as behavior_run
             gen = behavior_run(video_src, cfg, stream=True)
         elif scenario == "zone_detection":
+            from scenarios.zone_detection import run as zone_run
             gen = zone_run(video_src, cfg, stream=True)
         else:
+            from scenarios.line_crossing import run as metro_run
             gen = metro_run(video_src, cfg, stream=True)
     except Exception as e:
         print(f"[ERROR] scenario '{scenario}' initialization failed: {e}")
@@ -0,0 +1,84 @@
+"""Compare latency and throughput of the pytorch / onnx / openvino backends.
+
+Each backend is loaded through core.inference_backend (exporting and caching
+on first use), then timed on single frames (latency) and on batches
+(throughput) at the camera_manager inference width.
+
+Usage:
+    python benchmarks/bench_backends.py
+    python benchmarks/bench_backends.py --backends pytorch,onnx --video videos/campus2.mp4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.join(PROJECT_ROOT, "backend"))
+
+import numpy as np
+
+import camera_manager
+from bench_batching import load_frames
+from core.inference_backend import load_model
+
+
+def _predict(model, frames):
+    return model.predict(frames, classes=camera_manager.CLASSES, conf=camera_manager.CONF,
+                         iou=0.50, device="cpu", imgsz=camera_manager.INFER_WIDTH,
+                         verbose=False)
+
+
+def bench(backend: str, weights: str, frames: list, batch: int, warmup: int) -> dict:
+    t0    = time.perf_counter()
+    model = load_model(weights, camera_manager.INFER_WIDTH, backend)
+    load_s = time.perf_counter() - t0
+
+    for _ in range(warmup):
+        _predict(model, frames[:1])
+
+    lat = []
+    for f in frames:
+        t = time.perf_counter()
+        _predict(model, [f])
+        lat.append((time.perf_counter() - t) * 1000)
+
+    _predict(model, frames[:batch])
+    t = time.perf_counter()
+    done = 0
+    for i in range(0, len(frames) - batch + 1, batch):
+        _predict(model, frames[i:i + batch])
+        done += batch
+    fps = done / (time.perf_counter() - t)
+
+    return {"load_s": load_s, "p50": float(np.percentile(lat, 50)),
+            "p95": float(np.percentile(lat, 95)), "fps": fps}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--backends", default="pytorch,onnx,openvino")
+    ap.add_argument("--weights", default="yolov8s")
+    ap.add_argument("--video", default=None)
+    ap.add_argument("--frames", type=int, default=64)
+    ap.add_argument("--batch", type=int, default=8, help="batch size for the throughput run")
+    ap.add_argument("--warmup", type=int, default=3)
+    args = ap.parse_args()
+
+    frames = load_frames(args.video, args.frames)
+    print(f"{'backend':>10} {'load s':>8} {'p50 ms':>8} {'p95 ms':>8} {'fps@b' + str(args.batch):>10}")
+    for name in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        try:
+            r = bench(name, args.weights, frames, args.batch, args.warmup)
+        except Exception as exc:
+            print(f"{name:>10}  unavailable: {exc}")
+            continue
+        print(f"{name:>10} {r['load_s']:>8.1f} {r['p50']:>8.1f} {r['p95']:>8.1f} {r['fps']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
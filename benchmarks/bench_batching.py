@@ -0,0 +1,83 @@
+"""Compare inference throughput at different cross-camera batch sizes.
+
+Feeds the same person-detector used by camera_manager with frames at
+INFER_WIDTH and reports frames/sec for each batch size.
+
+Usage:
+    python benchmarks/bench_batching.py                       # synthetic frames
+    python benchmarks/bench_batching.py --video videos/campus2.mp4
+    python benchmarks/bench_batching.py --sizes 1,4,8,16 --frames 128
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(PROJECT_ROOT, "backend"))
+
+import cv2
+import numpy as np
+
+import camera_manager
+
+
+def load_frames(video: str | None, count: int) -> list[np.ndarray]:
+    """Return `count` frames at INFER_WIDTH, from a video or random noise."""
+    w = camera_manager.INFER_WIDTH
+    h = int(w * 9 / 16)
+    if video is None:
+        rng = np.random.default_rng(0)
+        return [rng.integers(0, 255, (h, w, 3), dtype=np.uint8) for _ in range(count)]
+
+    cap = cv2.VideoCapture(video)
+    frames: list[np.ndarray] = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            if not frames:
+                raise RuntimeError(f"Cannot read frames from {video}")
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            continue
+        fh, fw = frame.shape[:2]
+        frames.append(cv2.resize(frame, (w, int(fh * w / fw))))
+    cap.release()
+    return frames
+
+
+def run(sizes: list[int], frames: list[np.ndarray], warmup: int) -> None:
+    camera_manager._device = "cpu"
+    model = camera_manager._get_model()
+
+    for _ in range(warmup):
+        camera_manager._predict_batch(model, frames[:1])
+
+    print(f"{'batch':>6} {'frames/s':>10} {'ms/frame':>10}")
+    for bs in sizes:
+        camera_manager._predict_batch(model, frames[:bs])   # shape warm-up
+        t0 = time.perf_counter()
+        done = 0
+        for i in range(0, len(frames) - bs + 1, bs):
+            camera_manager._predict_batch(model, frames[i:i + bs])
+            done += bs
+        dt = time.perf_counter() - t0
+        print(f"{bs:>6} {done / dt:>10.1f} {dt * 1000 / done:>10.2f}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--video", default=None, help="sample frames from this file")
+    ap.add_argument("--sizes", default="1,4,8,16", help="comma-separated batch sizes")
+    ap.add_argument("--frames", type=int, default=96, help="frames per batch size")
+    ap.add_argument("--warmup", type=int, default=3)
+    args = ap.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    run(sizes, load_frames(args.video, args.frames), args.warmup)
+
+
+if __name__ == "__main__":
+    main()
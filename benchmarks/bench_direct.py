@@ -0,0 +1,110 @@
+"""Direct tensor inference path vs model.predict(): parity and per-frame cost.
+
+Runs the same frames through camera_manager's detector both ways — the
+ultralytics predictor and core/direct_infer.py — and reports
+
+    parity   frames with the same box count, boxes matched at IoU >= 0.99,
+             and the worst coordinate / confidence difference
+    latency  ms per frame of each path, per batch size, and the overhead saved
+
+Exits non-zero (before timing) when parity fails: a frame's box count
+differs, a box goes unmatched, or a matched box is off by more than --tol-xy
+pixels or --tol-conf confidence.
+
+Usage:
+    python benchmarks/bench_direct.py                          # synthetic frames
+    python benchmarks/bench_direct.py --video videos/campus2.mp4
+    python benchmarks/bench_direct.py --sizes 1,4 --frames 64 --model n
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.join(PROJECT_ROOT, "backend"))
+
+import numpy as np
+
+import camera_manager
+from bench_batching import load_frames
+from core.direct_infer import direct_detector
+from int8_report import _iou
+
+
+def _predict(model, frames: list, conf: float) -> list[np.ndarray]:
+    res = model.predict(frames, classes=camera_manager.CLASSES, conf=conf, iou=0.50,
+                        device="cpu", imgsz=camera_manager.INFER_WIDTH, verbose=False)
+    return [r.boxes.data.cpu().numpy() for r in res]
+
+
+def _direct(model, frames: list, conf: float) -> list[np.ndarray]:
+    return direct_detector(model)(frames, camera_manager.INFER_WIDTH, conf,
+                                  iou=0.50, classes=camera_manager.CLASSES)
+
+
+def parity(model, frames: list[np.ndarray], conf: float,
+           tol_xy: float, tol_conf: float) -> bool:
+    """Print the parity of the two paths; True when it is within tolerance."""
+    same = boxes = matched = 0
+    max_xy = max_conf = 0.0
+    for frame in frames:
+        ref, got = _predict(model, [frame], conf)[0], _direct(model, [frame], conf)[0]
+        same  += len(ref) == len(got)
+        boxes += len(ref)
+        if len(ref) and len(got):
+            iou = _iou(ref[:, :4], got[:, :4])
+            j   = iou.argmax(axis=1)
+            ok  = iou[np.arange(len(ref)), j] >= 0.99
+            matched += int(ok.sum())
+            if ok.any():
+                max_xy   = max(max_xy, float(np.abs(ref[ok, :4] - got[j[ok], :4]).max()))
+                max_conf = max(max_conf, float(np.abs(ref[ok, 4] - got[j[ok], 4]).max()))
+    print(f"parity: {same}/{len(frames)} frames same box count, "
+          f"{matched}/{boxes} predict() boxes matched (IoU >= 0.99)")
+    print(f"        max |Δxy| {max_xy:.3f} px   max |Δconf| {max_conf:.5f}")
+    return (same == len(frames) and matched == boxes
+            and max_xy <= tol_xy and max_conf <= tol_conf)
+
+
+def latency(model, frames: list[np.ndarray], sizes: list[int], conf: float) -> None:
+    print(f"\n{'batch':>6} {'predict ms':>11} {'direct ms':>10} {'saved ms':>9}")
+    for bs in sizes:
+        cost = {}
+        for name, fn in (("predict", _predict), ("direct", _direct)):
+            fn(model, frames[:bs], conf)                    # shape warm-up
+            t0 = time.perf_counter()
+            done = 0
+            for i in range(0, len(frames) - bs + 1, bs):
+                fn(model, frames[i:i + bs], conf)
+                done += bs
+            cost[name] = (time.perf_counter() - t0) * 1000 / done
+        print(f"{bs:>6} {cost['predict']:>11.2f} {cost['direct']:>10.2f} "
+              f"{cost['predict'] - cost['direct']:>9.2f}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--video", default=None, help="sample frames from this file")
+    ap.add_argument("--model", default=None, help="detector size (n/s/m); default INFER_MODEL")
+    ap.add_argument("--sizes", default="1,4", help="comma-separated batch sizes")
+    ap.add_argument("--frames", type=int, default=48, help="frames per measurement")
+    ap.add_argument("--conf", type=float, default=camera_manager.CONF)
+    ap.add_argument("--tol-xy", type=float, default=0.5, help="max box coordinate delta (px)")
+    ap.add_argument("--tol-conf", type=float, default=1e-3, help="max confidence delta")
+    args = ap.parse_args()
+
+    camera_manager._device = "cpu"
+    model  = camera_manager.get_model(args.model, camera_manager.INFER_WIDTH, device="cpu")
+    frames = load_frames(args.video, args.frames)
+    if not parity(model, frames, args.conf, args.tol_xy, args.tol_conf):
+        sys.exit(f"parity check failed (tolerance {args.tol_xy} px / {args.tol_conf} conf)")
+    latency(model, frames, [int(s) for s in args.sizes.split(",") if s.strip()], args.conf)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Reader CPU per camera: read() every frame vs grab() + retrieve() when used.
+
+Replays a video the way a camera reader pulls it, once with cap.read() on
+every frame (the old reader) and once with cap.grab() on every frame and
+cap.retrieve() only on every infer_every-th one (the current reader), and
+reports process CPU ms per source frame for each. Pacing is left out —
+both loops run flat out — so the numbers are the decode cost alone.
+
+Usage:
+    python benchmarks/bench_grab.py --video videos/campus2.mp4
+    python benchmarks/bench_grab.py --video videos/campus2.mp4 --every 1,2,3,5 --frames 600
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import cv2
+
+
+def cpu_ms(video: str, frames: int, every: int, grab: bool) -> float:
+    """Process CPU ms per source frame for one pass over `frames` frames."""
+    cap = cv2.VideoCapture(video)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open {video}")
+    t0, done = time.process_time(), 0
+    while done < frames:
+        if grab:
+            ok = cap.grab()
+            if ok and done % every == 0:
+                ok, _ = cap.retrieve()
+        else:
+            ok, _ = cap.read()
+        if not ok:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            continue
+        done += 1
+    cap.release()
+    return (time.process_time() - t0) * 1000 / done
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--video", required=True, help="source video file")
+    ap.add_argument("--every", default="1,2,3,5", help="comma-separated infer_every values")
+    ap.add_argument("--frames", type=int, default=300, help="source frames per measurement")
+    args = ap.parse_args()
+
+    cpu_ms(args.video, min(args.frames, 30), 1, False)      # codec warm-up
+    print(f"{'infer_every':>11} {'read ms':>8} {'grab ms':>8} {'saved':>7}")
+    for every in [int(e) for e in args.every.split(",") if e.strip()]:
+        read = cpu_ms(args.video, args.frames, every, False)
+        grab = cpu_ms(args.video, args.frames, every, True)
+        print(f"{every:>11} {read:>8.2f} {grab:>8.2f} {(read - grab) / read:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
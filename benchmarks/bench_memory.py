@@ -0,0 +1,93 @@
+"""Frame buffer memory: per-frame allocation vs the per-camera frame rings.
+
+Runs N file cameras through the real camera pipeline for a while, once with
+FRAME_RING_SIZE=0 (every frame allocates fresh arrays, as before) and once
+with the rings, each in a fresh interpreter, and reports
+
+    rss MB      mean / peak resident memory once the pipeline is warm
+    faults/fr   minor page faults per annotated frame — fresh large arrays
+                are mmap'ed and faulted in page by page, so this tracks
+                the allocation churn
+    alloc MB/s  the same as a rate (faults x page size)
+
+Usage:
+    python benchmarks/bench_memory.py --video videos/campus2.mp4
+    python benchmarks/bench_memory.py --video videos/campus2.mp4 --cameras 16 --seconds 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(PROJECT_ROOT, "backend"))
+
+PAGE = os.sysconf("SC_PAGE_SIZE")
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _frames(cm) -> int:
+    return sum(cs["frames_processed"] for cs in cm._camera_stats.values())
+
+
+def measure(video: str, cameras: int, seconds: float, warmup: float) -> dict:
+    """Run the pipeline in this process and sample memory after `warmup` seconds."""
+    import camera_manager as cm
+
+    for i in range(cameras):
+        cm.start(f"mem{i}", "behavior", {"video": video, "infer_every": 3, "det_cache": False})
+    time.sleep(warmup)
+
+    f0, flt0, t0 = _frames(cm), resource.getrusage(resource.RUSAGE_SELF).ru_minflt, time.time()
+    rss = []
+    while time.time() - t0 < seconds:
+        time.sleep(0.5)
+        rss.append(_rss_mb())
+    flt, frames, dt = (resource.getrusage(resource.RUSAGE_SELF).ru_minflt - flt0,
+                       _frames(cm) - f0, time.time() - t0)
+    cm.stop_all()
+    return {"rss_mean": sum(rss) / len(rss), "rss_peak": max(rss), "frames": frames,
+            "faults_per_frame": flt / max(frames, 1), "alloc_mb_s": flt * PAGE / 1e6 / dt}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--video", required=True, help="source video file")
+    ap.add_argument("--cameras", type=int, default=8)
+    ap.add_argument("--seconds", type=float, default=30.0, help="measurement window")
+    ap.add_argument("--warmup", type=float, default=15.0, help="seconds before measuring")
+    ap.add_argument("--one", action="store_true", help=argparse.SUPPRESS)   # child run
+    args = ap.parse_args()
+
+    if args.one:
+        print(json.dumps(measure(args.video, args.cameras, args.seconds, args.warmup)), flush=True)
+        os._exit(0)     # don't wait on the pipeline's daemon threads at teardown
+
+    print(f"{'frame ring':>10} {'rss MB':>14} {'frames':>7} {'faults/fr':>10} {'alloc MB/s':>11}")
+    for label, size in (("off", "0"), ("on", os.getenv("FRAME_RING_SIZE", "6"))):
+        out = subprocess.run([sys.executable, __file__, "--one", "--video", args.video,
+                              "--cameras", str(args.cameras), "--seconds", str(args.seconds),
+                              "--warmup", str(args.warmup)],
+                             env=dict(os.environ, FRAME_RING_SIZE=size),
+                             capture_output=True, text=True, check=True)
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        rss = f"{r['rss_mean']:.0f} / {r['rss_peak']:.0f}"
+        print(f"{label:>10} {rss:>14} {r['frames']:>7} {r['faults_per_frame']:>10.1f} "
+              f"{r['alloc_mb_s']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
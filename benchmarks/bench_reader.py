@@ -0,0 +1,124 @@
+"""Camera reader backends: cv2.VideoCapture vs the ffmpeg subprocess reader.
+
+Reads whole passes over a video through each reader the way the camera
+reader does — every frame grabbed, every infer_every-th one used and
+brought to ANNOTATE_WIDTH — with no pacing:
+
+    opencv     cv2.VideoCapture, grab() + retrieve()
+    ffmpeg     ffmpeg scales and decimates to infer_every itself
+    keyframes  ffmpeg decoding keyframes only ("keyframes": true cameras)
+
+and reports per stream
+
+    cpu ms/s   process CPU per second of video, ffmpeg's own CPU included —
+               1000 would be one core per camera
+    rss MB     peak resident memory of the stream (the ffmpeg process plus
+               what the reader adds to ours), sampled while it runs
+
+Each measurement runs in a fresh interpreter so allocations don't carry
+over. The ffmpeg binary is FFMPEG_BIN (default: ffmpeg on PATH). Linux only
+(/proc is read for memory).
+
+Usage:
+    python benchmarks/bench_reader.py --video videos/campus2.mp4
+    python benchmarks/bench_reader.py --video videos/campus2.mp4 --every 1,3 --passes 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(PROJECT_ROOT, "backend"))
+
+
+def _rss_mb(pid: int | str = "self") -> float:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def measure(reader: str, video: str, passes: int, every: int) -> dict:
+    """`passes` passes through `reader`: CPU ms per video second and peak RSS delta."""
+    import cv2
+
+    from camera_manager import ANNOTATE_WIDTH
+    from ffmpeg_reader import open_capture
+
+    probe    = cv2.VideoCapture(video)
+    duration = probe.get(cv2.CAP_PROP_FRAME_COUNT) / (probe.get(cv2.CAP_PROP_FPS) or 25.0)
+    probe.release()
+
+    base  = _rss_mb()
+    child = resource.getrusage(resource.RUSAGE_CHILDREN)
+    t0    = time.process_time()
+    cap   = open_capture(video, "opencv" if reader == "opencv" else "ffmpeg", ANNOTATE_WIDTH,
+                         every if reader == "ffmpeg" else 1, keyframes=reader == "keyframes")
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open {video} with {reader}")
+    # The ffmpeg readers hand over only frames that get used
+    use_every = every if reader == "opencv" else 1
+    done = grabbed = 0
+    peak = 0.0
+    while done < passes:
+        if not cap.grab():
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            done += 1
+            continue
+        if grabbed % use_every == 0:
+            _, frame = cap.retrieve()
+            if frame.shape[1] != ANNOTATE_WIDTH:
+                h, w  = frame.shape[:2]
+                frame = cv2.resize(frame, (ANNOTATE_WIDTH, int(h * ANNOTATE_WIDTH / w)))
+        grabbed += 1
+        if grabbed % 25 == 0 or reader == "keyframes":
+            proc = getattr(cap, "_proc", None)
+            peak = max(peak, _rss_mb() - base + (_rss_mb(proc.pid) if proc else 0.0))
+    cap.release()
+    cpu   = time.process_time() - t0
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu  += (after.ru_utime - child.ru_utime) + (after.ru_stime - child.ru_stime)
+    return {"cpu_ms": cpu * 1000 / (duration * passes), "rss_mb": peak}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--video", required=True, help="source video file")
+    ap.add_argument("--every", default="1,3", help="comma-separated infer_every values")
+    ap.add_argument("--passes", type=int, default=1, help="passes over the video per measurement")
+    ap.add_argument("--one", default=None, help=argparse.SUPPRESS)   # child: reader,every
+    args = ap.parse_args()
+
+    if args.one:
+        reader, every = args.one.split(",")
+        print(json.dumps(measure(reader, args.video, args.passes, int(every))))
+        return
+
+    def run(reader: str, every: int) -> None:
+        out = subprocess.run([sys.executable, __file__, "--video", args.video,
+                              "--passes", str(args.passes), "--one", f"{reader},{every}"],
+                             capture_output=True, text=True, check=True)
+        res = json.loads(out.stdout.strip().splitlines()[-1])
+        label = every if reader != "keyframes" else "-"
+        print(f"{label:>11} {reader:>9} {res['cpu_ms']:>9.1f} {res['rss_mb']:>8.1f}")
+
+    print(f"{'infer_every':>11} {'reader':>9} {'cpu ms/s':>9} {'rss MB':>8}")
+    for every in [int(e) for e in args.every.split(",") if e.strip()]:
+        for reader in ("opencv", "ffmpeg"):
+            run(reader, every)
+    run("keyframes", 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Reader threads: one per camera vs the shared timer-heap ReaderEngine.
+
+Runs N file cameras through the real camera pipeline, once with
+READER_WORKERS=0 (a reader thread per camera, as before) and once for each
+--workers value, each in a fresh interpreter, and reports
+
+    threads     live threads in the process
+    ctx sw/s    voluntary + involuntary context switches per second
+    cpu %       process CPU over wall time (100 = one core)
+    on time %   frames grabbed vs. the sources' frame rate — below 100 the
+                readers can't keep up and drop frames to catch up
+
+infer_every defaults high so the readers, not the detector, dominate.
+
+Usage:
+    python benchmarks/bench_reader_engine.py --video videos/campus2.mp4
+    python benchmarks/bench_reader_engine.py --video videos/campus2.mp4 --cameras 64 --workers 2,4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(PROJECT_ROOT, "backend"))
+
+
+def _counters(cm) -> tuple:
+    ru = resource.getrusage(resource.RUSAGE_SELF)
+    grabbed = sum(cs["frames_grabbed"] for cs in cm._camera_stats.values())
+    return time.perf_counter(), time.process_time(), ru.ru_nvcsw + ru.ru_nivcsw, grabbed
+
+
+def measure(video: str, cameras: int, every: int, seconds: float, warmup: float) -> dict:
+    """Run the pipeline in this process and measure after `warmup` seconds."""
+    import camera_manager as cm
+
+    for i in range(cameras):
+        cm.start(f"eng{i}", "behavior", {"video": video, "infer_every": every})
+    fps = cm._rate_params["eng0"][0]
+    time.sleep(warmup)
+
+    t0, cpu0, sw0, g0 = _counters(cm)
+    time.sleep(seconds)
+    t1, cpu1, sw1, g1 = _counters(cm)
+    threads = threading.active_count()
+    cm.stop_all()
+    dt = t1 - t0
+    return {"threads": threads, "ctx_s": (sw1 - sw0) / dt, "cpu": 100 * (cpu1 - cpu0) / dt,
+            "on_time": 100 * (g1 - g0) / (dt * fps * cameras)}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--video", required=True, help="source video file")
+    ap.add_argument("--cameras", type=int, default=32)
+    ap.add_argument("--workers", default="2,4", help="comma-separated READER_WORKERS values")
+    ap.add_argument("--every", type=int, default=1000, help="infer_every of every camera")
+    ap.add_argument("--seconds", type=float, default=20.0, help="measurement window")
+    ap.add_argument("--warmup", type=float, default=10.0, help="seconds before measuring")
+    ap.add_argument("--one", action="store_true", help=argparse.SUPPRESS)   # child run
+    args = ap.parse_args()
+
+    if args.one:
+        res = measure(args.video, args.cameras, args.every, args.seconds, args.warmup)
+        print(json.dumps(res), flush=True)
+        os._exit(0)     # don't wait on the pipeline's daemon threads at teardown
+
+    print(f"{'readers':>12} {'threads':>8} {'ctx sw/s':>9} {'cpu %':>6} {'on time %':>10}")
+    for workers in ["0"] + [w.strip() for w in args.workers.split(",") if w.strip()]:
+        out = subprocess.run([sys.executable, __file__, "--one", "--video", args.video,
+                              "--cameras", str(args.cameras), "--every", str(args.every),
+                              "--seconds", str(args.seconds), "--warmup", str(args.warmup)],
+                             env=dict(os.environ, READER_WORKERS=workers),
+                             capture_output=True, text=True, check=True)
+        # Reader threads may still log after the result line
+        r = json.loads([ln for ln in out.stdout.splitlines() if ln.startswith('{"')][-1])
+        label = "per camera" if workers == "0" else f"engine x{workers}"
+        print(f"{label:>12} {r['threads']:>8} {r['ctx_s']:>9.0f} {r['cpu']:>6.0f} "
+              f"{r['on_time']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
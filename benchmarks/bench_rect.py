@@ -0,0 +1,98 @@
+"""Rectangular vs square detector input: CPU time per frame.
+
+Feeds camera_manager's detector the same frames at several camera aspect
+ratios, both ways:
+
+    square  imgsz=INFER_WIDTH; a batch mixing aspect ratios is letterboxed
+            to INFER_WIDTH x INFER_WIDTH (uniform pytorch batches already
+            get the minimum rectangle from ultralytics)
+    rect    INFER_RECT=1: every frame at its stride-aligned (H, W) and
+            batches grouped by that shape, as the inference thread does
+
+and reports process CPU ms per frame for each, plus the share saved.
+
+Usage:
+    python benchmarks/bench_rect.py                          # synthetic frames
+    python benchmarks/bench_rect.py --video videos/campus2.mp4
+    python benchmarks/bench_rect.py --sizes 1,4 --frames 48 --direct
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.join(PROJECT_ROOT, "backend"))
+
+import cv2
+import numpy as np
+
+import camera_manager
+from bench_batching import load_frames
+
+# Camera aspect ratios (h / w) the benchmark cycles through
+ASPECTS = {"16:9": 9 / 16, "4:3": 3 / 4, "21:9": 9 / 21}
+
+
+def _reshape(frames: list[np.ndarray], aspects: list[float]) -> list[np.ndarray]:
+    """Frame i resized to INFER_WIDTH x aspect i (cycling) — one 'camera' per aspect."""
+    w = camera_manager.INFER_WIDTH
+    return [cv2.resize(f, (w, int(w * aspects[i % len(aspects)]))) for i, f in enumerate(frames)]
+
+
+def _square(model, batch: list) -> None:
+    camera_manager._predict_batch(model, batch, camera_manager.INFER_WIDTH)
+
+
+def _rect(model, batch: list) -> None:
+    groups: dict[tuple, list] = defaultdict(list)
+    for f in batch:
+        groups[camera_manager._rect_imgsz(*f.shape[:2], camera_manager.INFER_WIDTH)].append(f)
+    for imgsz, frames in groups.items():
+        camera_manager._predict_batch(model, frames, imgsz)
+
+
+def cpu_ms(fn, model, frames: list, bs: int) -> float:
+    """Process CPU ms per frame of `fn` over `frames` in batches of `bs`."""
+    fn(model, frames[:bs])                                  # shape warm-up
+    t0, done = time.process_time(), 0
+    for i in range(0, len(frames) - bs + 1, bs):
+        fn(model, frames[i:i + bs])
+        done += bs
+    return (time.process_time() - t0) * 1000 / done
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--video", default=None, help="sample frames from this file")
+    ap.add_argument("--model", default=None, help="detector size (n/s/m); default INFER_MODEL")
+    ap.add_argument("--sizes", default="1,4", help="comma-separated batch sizes")
+    ap.add_argument("--frames", type=int, default=48, help="frames per measurement")
+    ap.add_argument("--direct", action="store_true", help="use the direct tensor path (INFER_DIRECT=1)")
+    args = ap.parse_args()
+
+    camera_manager._device      = "cpu"
+    camera_manager.INFER_DIRECT = args.direct
+    model  = camera_manager.get_model(args.model, camera_manager.INFER_WIDTH, device="cpu")
+    frames = load_frames(args.video, args.frames)
+    sizes  = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    cases = [(name, [a]) for name, a in ASPECTS.items()] + [("mixed", list(ASPECTS.values()))]
+    print(f"{'cameras':>8} {'rect input':>11} {'batch':>6} {'square ms':>10} {'rect ms':>8} {'saved':>7}")
+    for name, aspects in cases:
+        shaped = _reshape(frames, aspects)
+        shapes = sorted({camera_manager._rect_imgsz(*f.shape[:2], camera_manager.INFER_WIDTH)
+                         for f in shaped})
+        label  = "/".join(f"{w}x{h}" for h, w in shapes) if len(shapes) == 1 else "per camera"
+        for bs in sizes:
+            sq, rc = cpu_ms(_square, model, shaped, bs), cpu_ms(_rect, model, shaped, bs)
+            print(f"{name:>8} {label:>11} {bs:>6} {sq:>10.2f} {rc:>8.2f} {(sq - rc) / sq:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
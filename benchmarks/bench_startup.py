@@ -0,0 +1,144 @@
+"""API process startup time: module import and time to the first `/` response.
+
+Measures, each in a fresh interpreter:
+
+    import app             what every uvicorn (re)start pays before serving
+    import camera_manager  the vision stack app.py defers to first use
+    first response         uvicorn spawn → first 200 from GET /
+
+and with --ready also the time until GET /api/system/ready turns 200. The
+server needs its database, as in normal operation (docker compose up db).
+--imports-only skips the server (no database at hand); its columns are
+left empty. --record appends the numbers to benchmarks/startup_times.csv,
+which is committed, so startup regressions show up in review against the
+earlier rows.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 5 --ready --record
+    python benchmarks/bench_startup.py --runs 5 --imports-only --record
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BACKEND_DIR  = os.path.join(PROJECT_ROOT, "backend")
+HISTORY_CSV  = os.path.join(PROJECT_ROOT, "benchmarks", "startup_times.csv")
+
+HEAVY = ("torch", "ultralytics", "cv2")
+
+_IMPORT_SNIPPET = """
+import sys, time
+t = time.perf_counter()
+import {module}
+ms = (time.perf_counter() - t) * 1000
+print(ms, ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def time_import(module: str, runs: int) -> tuple[float, str]:
+    """Median import time of `module` (ms) and which heavy modules it pulled in."""
+    times, heavy = [], ""
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _IMPORT_SNIPPET.format(module=module, heavy=HEAVY)],
+                             cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+        ms, _, heavy = out.stdout.strip().splitlines()[-1].partition(" ")
+        times.append(float(ms))
+    return statistics.median(times), heavy or "-"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(url: str, t0: float, timeout: float) -> float | None:
+    """Seconds since t0 until `url` answers 200, None on timeout."""
+    while time.perf_counter() - t0 < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as r:
+                if r.status == 200:
+                    return time.perf_counter() - t0
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.02)
+    return None
+
+
+def time_server(ready: bool, timeout: float) -> tuple[float | None, float | None]:
+    """(first `/` response, /api/system/ready 200) in seconds after spawning uvicorn."""
+    port = _free_port()
+    t0   = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "app:app", "--port", str(port)],
+                            cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        first = _wait_for(f"http://127.0.0.1:{port}/", t0, timeout)
+        warm  = _wait_for(f"http://127.0.0.1:{port}/api/system/ready", t0, timeout) if ready else None
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return first, warm
+
+
+def _median(xs: list) -> float | None:
+    return statistics.median(xs) if None not in xs else None
+
+
+def _fmt(v: float | None, scale: float = 1000) -> str:
+    return f"{v * scale:.0f}" if v is not None else "timeout"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=3, help="repetitions (median is reported)")
+    ap.add_argument("--ready", action="store_true", help="also time /api/system/ready")
+    ap.add_argument("--timeout", type=float, default=120.0, help="seconds to wait for the server")
+    ap.add_argument("--imports-only", action="store_true", help="skip the server timings")
+    ap.add_argument("--record", action="store_true", help=f"append to {os.path.relpath(HISTORY_CSV)}")
+    args = ap.parse_args()
+
+    app_ms, app_heavy = time_import("app", args.runs)
+    cm_ms, _          = time_import("camera_manager", args.runs)
+    print(f"import app             {app_ms:8.0f} ms   heavy modules loaded: {app_heavy}")
+    print(f"import camera_manager  {cm_ms:8.0f} ms   (deferred to first camera / preload)")
+
+    first, warm = [], []
+    for _ in range(0 if args.imports_only else args.runs):
+        f, w = time_server(args.ready, args.timeout)
+        first.append(f)
+        warm.append(w)
+    if first:
+        print(f"first / response       {_fmt(_median(first)):>8} ms")
+    if first and args.ready:
+        print(f"/api/system/ready      {_fmt(_median(warm)):>8} ms")
+
+    if args.record:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True).stdout.strip()
+        new = not os.path.exists(HISTORY_CSV)
+        with open(HISTORY_CSV, "a", newline="") as f:
+            w = csv.writer(f, lineterminator="\n")
+            if new:
+                w.writerow(["date", "commit", "import_app_ms", "import_camera_manager_ms",
+                            "first_response_ms", "ready_ms"])
+            w.writerow([datetime.date.today().isoformat(), commit, f"{app_ms:.0f}", f"{cm_ms:.0f}",
+                        _fmt(_median(first)) if first else "",
+                        _fmt(_median(warm)) if first and args.ready else ""])
+        print(f"recorded → {os.path.relpath(HISTORY_CSV)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""INT8 vs FP32 person-detection agreement and latency report.
+
+Treats the FP32 model's person boxes as reference and scores the INT8 model
+against them (IoU >= 0.5 greedy matching) on frames from videos/ that are
+disjoint from the calibration sample. Also reports per-frame latency of both.
+
+Usage:
+    python benchmarks/int8_report.py
+    python benchmarks/int8_report.py --frames 300 --reference onnx
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.join(PROJECT_ROOT, "backend"))
+
+import numpy as np
+
+import camera_manager
+from core.inference_backend import load_model
+from core.quantize import list_videos, sample_video_frames
+
+
+def _detect(model, frame) -> tuple[np.ndarray, float]:
+    t = time.perf_counter()
+    r = model.predict(frame, classes=camera_manager.CLASSES, conf=camera_manager.CONF,
+                      iou=0.50, device="cpu", imgsz=camera_manager.INFER_WIDTH,
+                      verbose=False)[0]
+    ms = (time.perf_counter() - t) * 1000
+    return r.boxes.xyxy.cpu().numpy(), ms
+
+
+def _iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of (N, 4) and (M, 4) xyxy boxes."""
+    tl = np.maximum(a[:, None, :2], b[None, :, :2])
+    br = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter  = np.prod(np.clip(br - tl, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+def _match(ref: np.ndarray, cand: np.ndarray, thr: float = 0.5) -> int:
+    if len(ref) == 0 or len(cand) == 0:
+        return 0
+    iou = _iou(ref, cand)
+    matched = 0
+    while True:
+        i, j = np.unravel_index(np.argmax(iou), iou.shape)
+        if iou[i, j] < thr:
+            return matched
+        matched += 1
+        iou[i, :] = -1
+        iou[:, j] = -1
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--weights", default="yolov8s")
+    ap.add_argument("--reference", default="pytorch", help="FP32 backend: pytorch or onnx")
+    ap.add_argument("--frames", type=int, default=200)
+    args = ap.parse_args()
+
+    videos = list_videos()
+    frames = sample_video_frames(videos, args.frames, camera_manager.INFER_WIDTH, offset=0.5)
+    if not frames:
+        sys.exit(f"No evaluation footage found in {os.path.join(PROJECT_ROOT, 'videos')}")
+
+    imgsz = camera_manager.INFER_WIDTH
+    fp32  = load_model(args.weights, imgsz, args.reference)
+    int8  = load_model(args.weights, imgsz, "int8")
+    _detect(fp32, frames[0]); _detect(int8, frames[0])   # warm-up
+
+    n_ref = n_cand = n_match = same_count = 0
+    lat_fp32: list[float] = []
+    lat_int8: list[float] = []
+    for f in frames:
+        ref,  t_ref  = _detect(fp32, f)
+        cand, t_cand = _detect(int8, f)
+        lat_fp32.append(t_ref); lat_int8.append(t_cand)
+        n_ref += len(ref); n_cand += len(cand)
+        n_match += _match(ref, cand)
+        same_count += len(ref) == len(cand)
+
+    recall    = n_match / n_ref if n_ref else 1.0
+    precision = n_match / n_cand if n_cand else 1.0
+    f1        = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+    print(f"frames evaluated : {len(frames)} from {len(videos)} video(s)")
+    print(f"persons  fp32/int8: {n_ref} / {n_cand}   matched @IoU0.5: {n_match}")
+    print(f"recall {recall:.3f}  precision {precision:.3f}  F1 {f1:.3f}  "
+          f"same-count frames {same_count / len(frames):.1%}")
+    print(f"{'':>8} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, lat in (("fp32", lat_fp32), ("int8", lat_int8)):
+        print(f"{name:>8} {np.mean(lat):>8.1f} {np.percentile(lat, 50):>8.1f} "
+              f"{np.percentile(lat, 95):>8.1f}")
+    print(f"speed-up: {np.mean(lat_fp32) / np.mean(lat_int8):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import cv2
 import time
-from ultralytics import YOLO
+from core.model_registry import track_view
 from collections import defaultdict, deque
 import math
 import torch
@@ -27,11 +27,7 @@ def run_behavior(video_path, cfg, stream=False):
     DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
     print(f"[INFO] Using device: {DEVICE}")
 
-    model = YOLO("yolov8s")
-    try:
-        model.fuse()
-    except Exception:
-        pass
+    model = track_view(cfg.get("model"), INFER_WIDTH, cfg.get("backend"), DEVICE)
 
     cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
@@ -0,0 +1,169 @@
+"""
+Direct tensor inference for the camera_manager hot loop.
+
+model.predict() pays a fixed per-call toll on top of the network itself:
+config merging, a fresh LetterBox per call, np.stack of the batch, and a
+Results object per frame holding a copy of the original image. For a
+per-frame person detector that overhead is paid thousands of times a
+minute.
+
+DirectDetector keeps the same numbers but skips the machinery:
+
+    - letterbox into a preallocated uint8 (B, H, W, 3) buffer per input
+      shape; the grey padding is written once, only the image area is
+      refreshed per call
+    - BGR→RGB, HWC→CHW and /255 straight into a preallocated float tensor
+    - the model's AutoBackend forward pass (works for every INFER_BACKEND)
+    - confidence/class filtering for the whole batch in one go, torchvision
+      NMS per frame, then unpad/unscale
+
+and returns a plain (N, 6) float32 array per frame — x1, y1, x2, y2, conf,
+cls in the input frame's pixels — which camera_manager consumes the same
+way as a Results object. Letterbox geometry and NMS follow ultralytics'
+predictor, so boxes match predict() to within float rounding
+(benchmarks/bench_direct.py checks that).
+"""
+
+from __future__ import annotations
+
+import threading
+
+import cv2
+import numpy as np
+import torch
+import torchvision
+
+PAD_VALUE = 114
+MAX_DET   = 300
+MAX_NMS   = 30000
+_MAX_WH   = 7680        # per-class box offset, as in ultralytics' NMS
+
+
+class DirectDetector:
+    """predict()-equivalent person detector without the per-call overhead."""
+
+    def __init__(self, model):
+        predictor = getattr(model, "predictor", None)
+        if predictor is None or predictor.model is None:
+            raise RuntimeError("model has no set-up predictor — run predict() once first")
+        self.backend = predictor.model
+        self.device  = self.backend.device
+        self.fp16    = bool(getattr(self.backend, "fp16", False))
+        self.stride  = int(max(getattr(self.backend, "stride", 32), 32))
+        # ultralytics only letterboxes to the minimum rectangle for models
+        # that accept any input size
+        fmt          = getattr(self.backend, "format", "pt" if getattr(self.backend, "pt", False) else "")
+        self.rect    = fmt == "pt" or (bool(getattr(self.backend, "dynamic", False)) and fmt != "imx")
+        # ...and static exports always run at their export size
+        fixed        = None if self.rect else getattr(self.backend, "imgsz", None)
+        self.fixed   = tuple(fixed) if isinstance(fixed, (list, tuple)) else fixed
+        self._lock   = threading.Lock()
+        # (B, H, W) → (uint8 HWC buffer, float CHW tensor, per-slot placement)
+        self._buffers: dict[tuple, tuple] = {}
+
+    def _geometry(self, h: int, w: int, imgsz: int | tuple, rect: bool) -> tuple:
+        """LetterBox.get_params: (H, W, new_h, new_w, top, left, gain_y, gain_x)."""
+        out_h, out_w = (imgsz, imgsz) if isinstance(imgsz, int) else imgsz
+        r = min(out_h / h, out_w / w)
+        new_w, new_h = round(w * r), round(h * r)
+        dw, dh = out_w - new_w, out_h - new_h
+        if rect:
+            dw, dh = dw % self.stride, dh % self.stride
+        top, left = round(dh / 2 - 0.1), round(dw / 2 - 0.1)
+        return new_h + dh, new_w + dw, new_h, new_w, top, left, new_h / h, new_w / w
+
+    def _buffer(self, b: int, hh: int, ww: int) -> tuple:
+        buf = self._buffers.get((b, hh, ww))
+        if buf is None:
+            host = np.full((b, hh, ww, 3), PAD_VALUE, dtype=np.uint8)
+            dev  = torch.empty((b, 3, hh, ww), device=self.device,
+                               dtype=torch.float16 if self.fp16 else torch.float32)
+            buf  = self._buffers[(b, hh, ww)] = (host, dev, [None] * b)
+        return buf
+
+    def __call__(self, frames: list, imgsz: int | tuple, conf: float, iou: float = 0.5,
+                 classes: list | None = None) -> list[np.ndarray]:
+        """BGR uint8 frames → one (N, 6) float32 array per frame; imgsz is S or (H, W)."""
+        if not frames:
+            return []
+        imgsz = self.fixed or imgsz
+        # Mixed frame sizes get full-size letterboxes so they can share a batch
+        rect  = self.rect and len({f.shape for f in frames}) == 1
+        geoms = [self._geometry(*f.shape[:2], imgsz, rect) for f in frames]
+        hh, ww = geoms[0][:2]
+
+        with self._lock:
+            host, x, placed = self._buffer(len(frames), hh, ww)
+            for i, (frame, g) in enumerate(zip(frames, geoms)):
+                _, _, nh, nw, top, left, _, _ = g
+                if placed[i] != (nh, nw, top, left):
+                    host[i] = PAD_VALUE         # placement changed — repaint the border
+                    placed[i] = (nh, nw, top, left)
+                if frame.shape[:2] == (nh, nw):
+                    host[i, top:top + nh, left:left + nw] = frame
+                elif left == 0 and nw == ww:
+                    # Full-width rows are contiguous — resize straight into the buffer
+                    cv2.resize(frame, (nw, nh), dst=host[i, top:top + nh],
+                               interpolation=cv2.INTER_LINEAR)
+                else:
+                    host[i, top:top + nh, left:left + nw] = cv2.resize(
+                        frame, (nw, nh), interpolation=cv2.INTER_LINEAR)
+
+            with torch.inference_mode():
+                x.copy_(torch.from_numpy(host).to(self.device).permute(0, 3, 1, 2).flip(1))
+                x.div_(255)
+                preds = self.backend(x)
+                if isinstance(preds, (list, tuple)):
+                    preds = preds[0]
+                dets = self._nms(preds.float(), conf, iou, classes)
+
+        out = []
+        for b, g in enumerate(geoms):
+            _, _, _, _, top, left, gy, gx = g
+            det = dets[dets[:, 0] == b, 1:].cpu().numpy()
+            h, w = frames[b].shape[:2]
+            det[:, [0, 2]] = ((det[:, [0, 2]] - left) / gx).clip(0, w)
+            det[:, [1, 3]] = ((det[:, [1, 3]] - top) / gy).clip(0, h)
+            out.append(det)
+        return out
+
+    @staticmethod
+    def _nms(preds: torch.Tensor, conf: float, iou: float,
+             classes: list | None) -> torch.Tensor:
+        """(B, 4 + nc, A) raw head output → (K, 7) rows of b, x1, y1, x2, y2, conf, cls."""
+        preds = preds.transpose(1, 2)                   # (B, A, 4 + nc)
+        score, cls = preds[..., 4:].max(-1)
+        keep = score > conf
+        if classes is not None:
+            keep &= torch.isin(cls, torch.as_tensor(classes, device=cls.device))
+
+        # Filtering and box decoding are done for the whole batch at once;
+        # only the NMS itself runs per image (offsetting images into one call
+        # shifts IoUs by float rounding and breaks parity with predict())
+        out = []
+        for b in range(preds.shape[0]):
+            a = keep[b].nonzero().squeeze(1)
+            if len(a) > MAX_NMS:
+                a = a[score[b, a].topk(MAX_NMS).indices]
+            xywh = preds[b, a, :4]
+            xyxy = torch.cat([xywh[:, :2] - xywh[:, 2:] / 2, xywh[:, :2] + xywh[:, 2:] / 2], 1)
+            s, c = score[b, a], cls[b, a].float()
+            kept = torchvision.ops.nms(xyxy + c[:, None] * _MAX_WH, s, iou)[:MAX_DET]
+            out.append(torch.cat([torch.full_like(s[kept, None], b), xyxy[kept],
+                                  s[kept, None], c[kept, None]], 1))
+        return torch.cat(out)
+
+
+_detectors: dict[int, DirectDetector] = {}
+_lock = threading.Lock()
+
+
+def direct_detector(model) -> DirectDetector:
+    """Shared DirectDetector for a (registry-owned, warmed) YOLO model."""
+    det = _detectors.get(id(model))
+    if det is None:
+        with _lock:
+            det = _detectors.get(id(model))
+            if det is None:
+                det = _detectors[id(model)] = DirectDetector(model)
+    return det
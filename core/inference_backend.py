@@ -0,0 +1,96 @@
+"""
+Pluggable inference backend for the YOLO person detector.
+
+    pytorch   — ultralytics eager model (fused), the original path
+    onnx      — ONNX Runtime, exported once and cached on disk
+    openvino  — OpenVINO IR, exported once and cached on disk
+    int8      — ONNX Runtime with a post-training INT8 quantized model,
+                calibrated on frames from videos/ (see core/quantize.py)
+
+Weights, the fused checkpoint and exported artifacts all come from the
+local model store (core/model_store.py), keyed by the weights' checksum and
+imgsz, e.g. models/<checksum>/480.onnx, and are reused across restarts —
+nothing is downloaded or rebuilt at startup once the store is populated.
+Every backend comes back as an ultralytics YOLO object, so predict()/track()
+callers don't change.
+
+Select with INFER_BACKEND=pytorch|onnx|openvino|int8, or per pipeline with the
+"backend" key of a scenario config.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+
+from ultralytics import YOLO
+
+from core import model_store
+
+DEFAULT_BACKEND = os.getenv("INFER_BACKEND", "pytorch").strip().lower()
+
+BACKENDS = ("pytorch", "onnx", "openvino", "int8")
+
+_EXPORT_FORMAT = {"onnx": "onnx", "openvino": "openvino"}
+_export_lock   = threading.Lock()
+
+
+def resolve_backend(backend: str | None = None) -> str:
+    name = (backend or DEFAULT_BACKEND).strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{name}' (expected one of {BACKENDS})")
+    return name
+
+
+def artifact_path(weights: str, imgsz: int, backend: str) -> str:
+    """Store location of the exported artifact for (weights, imgsz, backend)."""
+    return model_store.artifact_path(weights, imgsz, backend)
+
+
+def _export(weights: str, imgsz: int, backend: str, dest: str) -> None:
+    print(f"[inference_backend] exporting {weights} → {backend} imgsz={imgsz} (one-time)...")
+    src = YOLO(model_store.weights_path(weights))
+    # dynamic=True keeps batch and input size free for batched predict()
+    out = src.export(format=_EXPORT_FORMAT[backend], imgsz=imgsz,
+                     dynamic=True, half=False, verbose=False)
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp = f"{dest}.tmp{os.getpid()}"
+    shutil.move(str(out), tmp)
+    try:
+        os.replace(tmp, dest)
+    except OSError:
+        # Another process finished the same export first — keep theirs
+        if os.path.isdir(tmp):
+            shutil.rmtree(tmp, ignore_errors=True)
+        else:
+            os.remove(tmp)
+    model_store.record_variant(weights, dest)
+
+
+def load_model(weights: str = "yolov8s", imgsz: int = 640,
+               backend: str | None = None) -> YOLO:
+    """Return a ready-to-predict YOLO for the requested backend."""
+    backend = resolve_backend(backend)
+
+    if backend == "pytorch":
+        model = YOLO(model_store.fused_path(weights))
+        try:    # no-op for the stored fused checkpoint
+            model.fuse()
+        except Exception:
+            pass
+        return model
+
+    path = artifact_path(weights, imgsz, backend)
+    with _export_lock:
+        if backend == "int8" and not os.path.exists(path):
+            from core.quantize import quantize_int8
+            fp32 = artifact_path(weights, imgsz, "onnx")
+            if not os.path.exists(fp32):
+                _export(weights, imgsz, "onnx", fp32)
+            quantize_int8(fp32, path, imgsz)
+            model_store.record_variant(weights, path)
+        elif not os.path.exists(path):
+            _export(weights, imgsz, backend, path)
+    print(f"[inference_backend] using cached {backend} model {path}")
+    return YOLO(path, task="detect")
@@ -0,0 +1,92 @@
+"""
+Process-wide registry of loaded person detectors.
+
+Every consumer — camera_manager's infer-thread and pool workers as well as
+the legacy /stream/{scenario} pipelines — gets its model from here, so each
+(weights, backend, device, imgsz) combination is loaded and fused once per
+process, however many cameras or browser tabs use it.
+
+    get_model(...)   the shared YOLO, for predict() from the inference path
+    track_view(...)  a per-stream handle for track(): its own tracker state
+                     on top of the shared weights. ultralytics serialises
+                     inference on the shared predictor's lock, so views are
+                     safe to use from several stream threads.
+
+Weights are picked by size: "n", "s", "m" (or the full "yolov8n" etc.).
+INFER_MODEL sets the default.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import threading
+
+import numpy as np
+import torch
+from ultralytics import YOLO
+
+from core.inference_backend import load_model, resolve_backend
+
+MODEL_SIZES     = {"n": "yolov8n", "s": "yolov8s", "m": "yolov8m"}
+DEFAULT_WEIGHTS = os.getenv("INFER_MODEL", "yolov8s").strip().lower()
+
+_models: dict[tuple, YOLO]           = {}
+_locks:  dict[tuple, threading.Lock] = {}
+_lock = threading.Lock()
+
+
+def default_device() -> str:
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def resolve_weights(name: str | None = None) -> str:
+    """'n' / 's' / 'm' / 'yolov8s' / None → weights name."""
+    name = (name or DEFAULT_WEIGHTS).strip().lower()
+    if name in MODEL_SIZES:
+        return MODEL_SIZES[name]
+    if name in MODEL_SIZES.values():
+        return name
+    raise ValueError(f"Unknown model '{name}' (expected one of {sorted(MODEL_SIZES)})")
+
+
+def get_model(weights: str | None = None, imgsz: int = 640,
+              backend: str | None = None, device: str | None = None) -> YOLO:
+    """Shared, warmed-up model for (weights, backend, device, imgsz)."""
+    key = (resolve_weights(weights), resolve_backend(backend), device or default_device(), imgsz)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        key_lock = _locks.setdefault(key, threading.Lock())
+    # Per-key lock: a slow export of one model doesn't block the others
+    with key_lock:
+        model = _models.get(key)
+        if model is None:
+            weights, backend, device, imgsz = key
+            print(f"[model_registry] loading {weights} backend={backend} "
+                  f"device={device} imgsz={imgsz}...")
+            model = load_model(weights, imgsz, backend)
+            # Set up the predictor now so every user shares one AutoBackend
+            model.predict(np.zeros((imgsz, imgsz, 3), dtype=np.uint8),
+                          device=device, imgsz=imgsz, verbose=False)
+            _models[key] = model
+            print(f"[model_registry] {weights} ready.")
+    return model
+
+
+def track_view(weights: str | None = None, imgsz: int = 640,
+               backend: str | None = None, device: str | None = None) -> YOLO:
+    """Per-stream handle on a shared model with its own tracker state."""
+    base = get_model(weights, imgsz, backend, device)
+    view = copy.copy(base)
+    view.callbacks = {event: list(fns) for event, fns in base.callbacks.items()}
+    view.predictor = copy.copy(base.predictor)
+    view.predictor.callbacks = view.callbacks
+    return view
+
+
+def loaded() -> list[dict]:
+    return [{"weights": w, "backend": b, "device": d, "imgsz": s}
+            for w, b, d, s in list(_models)]
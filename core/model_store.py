@@ -0,0 +1,202 @@
+"""
+Local model artifact store.
+
+Production nodes have no internet access and cold starts should not redo
+work, so every model file the detector needs lives under MODEL_STORE_DIR,
+keyed by the SHA-256 of the source weights:
+
+    models/
+        index.json                      name → checksum, e.g. "yolov8s" → "3f2a…"
+        3f2a9c…/                        one entry per distinct weights file
+            meta.json                   names, checksum, size, variants built
+            weights.pt                  the original checkpoint
+            fused.pt                    conv+bn fused once, loads ready to run
+            480.onnx  480-int8.onnx  480_openvino_model/   exports per imgsz
+
+Exports sit under the checksum of the weights they came from, so swapping
+the weights behind a name can never serve a stale export.
+
+Resolving a name never touches the network: the index is checked first,
+then local files (a path, or <name>.pt in the working directory or the
+project root), which are ingested. Only with MODEL_STORE_OFFLINE=0 may
+ultralytics download missing weights. Pre-populate the store at image build:
+
+    python -m core.model_store fetch yolov8n yolov8s yolov8m --imgsz 480
+    python -m core.model_store list
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+PROJECT_ROOT        = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MODEL_STORE_DIR     = os.getenv("MODEL_STORE_DIR",
+                                os.getenv("MODEL_CACHE_DIR", os.path.join(PROJECT_ROOT, "models")))
+MODEL_STORE_OFFLINE = os.getenv("MODEL_STORE_OFFLINE", "0").strip().lower() in ("1", "true", "yes")
+
+_VARIANT_FILES = {
+    "onnx":     "{imgsz}.onnx",
+    "int8":     "{imgsz}-int8.onnx",
+    # ultralytics recognises OpenVINO dirs by the _openvino_model suffix
+    "openvino": "{imgsz}_openvino_model",
+}
+
+_lock = threading.RLock()
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _read_json(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path: str, data: dict) -> None:
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _stem(name: str) -> str:
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+def _entry(checksum: str) -> str:
+    return os.path.join(MODEL_STORE_DIR, checksum[:16])
+
+
+def ingest(name: str, path: str) -> str:
+    """Copy weights file `path` into the store under `name`; returns its entry dir."""
+    checksum = _sha256(path)
+    entry    = _entry(checksum)
+    with _lock:
+        os.makedirs(entry, exist_ok=True)
+        dest = os.path.join(entry, "weights.pt")
+        if not os.path.exists(dest):
+            tmp = f"{dest}.tmp{os.getpid()}"
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, dest)
+        meta = _read_json(os.path.join(entry, "meta.json"))
+        meta.update(checksum=checksum, size=os.path.getsize(dest))
+        meta["names"] = sorted(set(meta.get("names", [])) | {_stem(name)})
+        meta.setdefault("variants", {})
+        _write_json(os.path.join(entry, "meta.json"), meta)
+
+        index = _read_json(os.path.join(MODEL_STORE_DIR, "index.json"))
+        index[_stem(name)] = checksum
+        _write_json(os.path.join(MODEL_STORE_DIR, "index.json"), index)
+    print(f"[model_store] {_stem(name)} → {checksum[:16]} ({meta['size'] / 1e6:.1f} MB)")
+    return entry
+
+
+def _local_file(name: str) -> str | None:
+    candidates = [name] if os.path.splitext(name)[1] else []
+    candidates += [os.path.join(d, f"{_stem(name)}.pt") for d in (os.getcwd(), PROJECT_ROOT)]
+    return next((p for p in candidates if os.path.isfile(p)), None)
+
+
+def entry_dir(name: str) -> str:
+    """Store entry of weights `name` ("yolov8s", "yolov8s.pt" or a path)."""
+    checksum = _read_json(os.path.join(MODEL_STORE_DIR, "index.json")).get(_stem(name))
+    if checksum and os.path.exists(os.path.join(_entry(checksum), "weights.pt")):
+        return _entry(checksum)
+
+    path = _local_file(name)
+    if path is None:
+        if MODEL_STORE_OFFLINE:
+            raise FileNotFoundError(
+                f"Model '{_stem(name)}' is not in the model store ({MODEL_STORE_DIR}) and "
+                f"MODEL_STORE_OFFLINE=1 — run: python -m core.model_store fetch {_stem(name)}")
+        from ultralytics.utils.downloads import attempt_download_asset
+        path = attempt_download_asset(f"{_stem(name)}.pt")
+    return ingest(name, path)
+
+
+def weights_path(name: str) -> str:
+    return os.path.join(entry_dir(name), "weights.pt")
+
+
+def artifact_path(name: str, imgsz: int, backend: str) -> str:
+    """Location of an exported variant ("onnx", "int8", "openvino") of `name`."""
+    return os.path.join(entry_dir(name), _VARIANT_FILES[backend].format(imgsz=imgsz))
+
+
+def record_variant(name: str, path: str) -> None:
+    """Note a built variant in the entry's meta.json."""
+    entry = entry_dir(name)
+    with _lock:
+        meta = _read_json(os.path.join(entry, "meta.json"))
+        meta.setdefault("variants", {})[os.path.basename(path)] = {
+            "built": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        _write_json(os.path.join(entry, "meta.json"), meta)
+
+
+def fused_path(name: str) -> str:
+    """Conv+bn fused checkpoint of `name`, built on first use."""
+    path = os.path.join(entry_dir(name), "fused.pt")
+    if os.path.exists(path):
+        return path
+
+    import torch
+    from ultralytics import YOLO
+    model = YOLO(weights_path(name))
+    model.fuse()
+    ckpt = {k: v for k, v in (model.ckpt or {}).items() if k not in ("model", "ema", "optimizer")}
+    tmp  = f"{path}.tmp{os.getpid()}"
+    torch.save({**ckpt, "model": model.model}, tmp)
+    os.replace(tmp, path)
+    record_variant(name, path)
+    return path
+
+
+def entries() -> list[dict]:
+    """meta.json of every store entry."""
+    index = _read_json(os.path.join(MODEL_STORE_DIR, "index.json"))
+    return [_read_json(os.path.join(_entry(c), "meta.json")) for c in sorted(set(index.values()))]
+
+
+def main() -> None:
+    from core.inference_backend import BACKENDS, load_model
+
+    ap = argparse.ArgumentParser(description="Pre-populate or inspect the local model store.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    fetch = sub.add_parser("fetch", help="store weights and build their variants")
+    fetch.add_argument("names", nargs="+", help="e.g. yolov8s or n/s/m, or a .pt path")
+    fetch.add_argument("--imgsz", type=int, nargs="+", default=[480])
+    fetch.add_argument("--backend", nargs="+", default=["pytorch"], choices=BACKENDS)
+    sub.add_parser("list", help="print the store's entries")
+    args = ap.parse_args()
+
+    if args.cmd == "list":
+        print(json.dumps(entries(), indent=2))
+        return
+
+    from core.model_registry import MODEL_SIZES
+    for name in args.names:
+        name = MODEL_SIZES.get(name, name)
+        fused_path(name)
+        for backend in args.backend:
+            for imgsz in args.imgsz:
+                load_model(name, imgsz, backend)     # exports into the store if missing
+    print(f"[model_store] ready: {MODEL_STORE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Post-training INT8 quantization of the person detector.
+
+The FP32 ONNX export from core.inference_backend is statically quantized with
+ONNX Runtime, calibrated on frames sampled from our own footage in videos/.
+The Detect head (last top-level module) is left in FP32 — quantizing the box
+regression / class concat costs far more mAP than it saves in latency.
+
+Used by INFER_BACKEND=int8; see benchmarks/int8_report.py for the
+agreement/latency report against the FP32 model.
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import re
+
+import cv2
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+VIDEOS_DIR   = os.path.join(PROJECT_ROOT, "videos")
+CALIB_FRAMES = int(os.getenv("INT8_CALIB_FRAMES", "128"))
+
+VIDEO_EXTS = (".mp4", ".avi", ".mkv", ".mov", ".webm")
+
+
+def list_videos(videos_dir: str = VIDEOS_DIR) -> list[str]:
+    return sorted(p for p in glob.glob(os.path.join(videos_dir, "*"))
+                  if p.lower().endswith(VIDEO_EXTS))
+
+
+def sample_video_frames(paths: list[str], count: int, width: int,
+                        offset: float = 0.0) -> list[np.ndarray]:
+    """
+    Evenly sample `count` frames across `paths`, resized to `width`.
+    `offset` (0–1) shifts the sampling grid so calibration and evaluation
+    can draw disjoint frames from the same videos.
+    """
+    if not paths:
+        return []
+    per_video = max(1, count // len(paths))
+    frames: list[np.ndarray] = []
+    for path in paths:
+        cap   = cv2.VideoCapture(path)
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or 0
+        if total <= 0:
+            cap.release()
+            continue
+        step = total / per_video
+        for i in range(per_video):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int((i + offset) * step) % total)
+            ret, frame = cap.read()
+            if not ret:
+                continue
+            h, w = frame.shape[:2]
+            frames.append(cv2.resize(frame, (width, int(h * width / w))))
+        cap.release()
+    return frames[:count]
+
+
+def letterbox_tensor(frame: np.ndarray, imgsz: int) -> np.ndarray:
+    """BGR frame → (1, 3, imgsz, imgsz) float32, same letterbox as ultralytics."""
+    h, w = frame.shape[:2]
+    r    = min(imgsz / h, imgsz / w)
+    nh, nw = int(round(h * r)), int(round(w * r))
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    top, left = (imgsz - nh) // 2, (imgsz - nw) // 2
+    canvas[top:top + nh, left:left + nw] = cv2.resize(frame, (nw, nh))
+    x = canvas[:, :, ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0
+    return x[None]
+
+
+class _FrameCalibrationReader:
+    """onnxruntime CalibrationDataReader over pre-sampled frames."""
+
+    def __init__(self, input_name: str, frames: list[np.ndarray], imgsz: int):
+        self._items = iter([{input_name: letterbox_tensor(f, imgsz)} for f in frames])
+
+    def get_next(self):
+        return next(self._items, None)
+
+
+def _head_nodes(model) -> list[str]:
+    """Names of nodes in the last top-level module (/model.N/…) — the Detect head."""
+    idx = [int(m.group(1)) for n in model.graph.node
+           if (m := re.match(r"/model\.(\d+)/", n.name))]
+    if not idx:
+        return []
+    prefix = f"/model.{max(idx)}/"
+    return [n.name for n in model.graph.node if n.name.startswith(prefix)]
+
+
+def quantize_int8(fp32_path: str, out_path: str, imgsz: int,
+                  frames: list[np.ndarray] | None = None) -> str:
+    """Statically quantize `fp32_path` into `out_path` and return it."""
+    import onnx
+    from onnxruntime.quantization import (CalibrationMethod, QuantFormat,
+                                          QuantType, quantize_static)
+
+    if frames is None:
+        videos = list_videos()
+        frames = sample_video_frames(videos, CALIB_FRAMES, imgsz)
+    if not frames:
+        raise RuntimeError(f"INT8 calibration needs sample footage in {VIDEOS_DIR}")
+
+    fp32       = onnx.load(fp32_path)
+    input_name = fp32.graph.input[0].name
+    print(f"[quantize] calibrating INT8 on {len(frames)} frames → {out_path}")
+
+    tmp = f"{out_path}.tmp{os.getpid()}.onnx"
+    quantize_static(
+        fp32_path, tmp,
+        _FrameCalibrationReader(input_name, frames, imgsz),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+        calibrate_method=CalibrationMethod.MinMax,
+        nodes_to_exclude=_head_nodes(fp32),
+    )
+
+    # Keep ultralytics metadata (stride, names, imgsz) so YOLO() can load it
+    q = onnx.load(tmp)
+    del q.metadata_props[:]
+    q.metadata_props.extend(fp32.metadata_props)
+    onnx.save(q, tmp)
+    os.replace(tmp, out_path)
+    return out_path
@@ -1,6 +1,6 @@
 import cv2
 import time
-from ultralytics import YOLO
+from core.model_registry import track_view
 from collections import defaultdict
 import torch
 
@@ -37,11 +37,8 @@ def run(video, cfg, stream=False):
     print(f"[INFO] Using device: {DEVICE}")
 
     # ── MODEL ─────────────────────────────────────────────────────────────────
-    model = YOLO("yolov8s")
-    try:
-        model.fuse()
-    except Exception:
-        pass
+    INFER_WIDTH = 640
+    model = track_view(cfg.get("model"), INFER_WIDTH, cfg.get("backend"), DEVICE)
 
     # ── VIDEO ─────────────────────────────────────────────────────────────────
     cap = cv2.VideoCapture(video)
@@ -52,7 +49,6 @@ def run(video, cfg, stream=False):
     fps = fps if fps > 0 else 25
     frame_time = 1.0 / fps
 
-    INFER_WIDTH          = 640
     CROSS_CONFIRM_FRAMES = 3
     INFER_EVERY          = int(cfg.get("infer_every", 1))
 
@@ -1,7 +1,7 @@
 import cv2
 import time
 import numpy as np
-from ultralytics import YOLO
+from core.model_registry import track_view
 from collections import defaultdict
 import torch
 
@@ -39,11 +39,8 @@ def run(video, cfg, stream=False):
     print(f"[INFO] Using device: {DEVICE}")
 
     # ── MODEL ─────────────────────────────────────────────────────────────────
-    model = YOLO("yolov8s")
-    try:
-        model.fuse()
-    except Exception:
-        pass
+    INFER_WIDTH = 640
+    model = track_view(cfg.get("model"), INFER_WIDTH, cfg.get("backend"), DEVICE)
 
     # ── VIDEO ─────────────────────────────────────────────────────────────────
     cap = cv2.VideoCapture(video)
@@ -56,7 +53,6 @@ def run(video, cfg, stream=False):
 
     print(f"[INFO] Video FPS: {fps:.1f}  target frame_time: {frame_time*1000:.1f} ms")
 
-    INFER_WIDTH         = 640
     ZONE_CONFIRM_FRAMES = 3  # consecutive frames to confirm zone entry
 
     # per-track zone confirmation buffer